@@ -1,21 +1,41 @@
+import os
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from backend.fact_checker import FactChecker
 from backend.social_monitor import SocialMonitor
+from backend.monitor_pipeline import MonitorPipeline
+from backend.feed_merge import TopN
 from backend.viral_tracker import ViralTracker
+from backend.cascade_store import CascadeStore
 from backend.origin_tracer import OriginTracer
 
+# Loading the models at startup costs memory and CPU even in sessions that never fact-check
+WARM_UP_ON_START = os.getenv("SOTERIA_WARM_UP") == "1"
+
 @st.cache_resource
 def load_components():
+    # FactChecker is cheap to build; its models load lazily, warmed in the background on start or first use
+    fact_checker = FactChecker()
+    if WARM_UP_ON_START:
+        fact_checker.warm_up()
     return {
-        'fact_checker': FactChecker(),
+        'fact_checker': fact_checker,
         'social_monitor': SocialMonitor(),
-        'viral_tracker': ViralTracker(),
+        'viral_tracker': ViralTracker(store=CascadeStore()),
         'origin_tracer': OriginTracer()
     }
 
+def render_feed(posts):
+    for post in posts:
+        st.markdown(f"**@{post['username']}** - {post['platform']}")
+        st.markdown(post['content'])
+        if post.get('matched_terms'):
+            st.caption("Matched: " + ", ".join(post['matched_terms']))
+        st.markdown(f"*{post['timestamp']} • {post['engagement']} interactions*")
+        st.markdown("---")
+
 def render():
     components = load_components()
 
@@ -32,16 +52,34 @@ def render():
         else:
             claim = st.text_input("Enter social media post URL/handle:")
 
+        if claim and not WARM_UP_ON_START and 'fact_checker_warmed' not in st.session_state:
+            # Start loading the models while the user is still reviewing their input
+            components['fact_checker'].warm_up()
+            st.session_state.fact_checker_warmed = True
+
         if st.button("Check Claim", type="primary"):
             if claim:
                 with st.spinner("Analyzing claim..."):
-                    result = components['fact_checker'].check_fact(claim)
+                    if input_type == "Text":
+                        result = components['fact_checker'].check_document(claim)
+                    elif claim.strip().lower().startswith(('http://', 'https://', 'www.')):
+                        url = claim.strip() if '://' in claim else f"https://{claim.strip()}"
+                        result = components['fact_checker'].check_url(url)
+                    else:
+                        result = components['fact_checker'].check_fact(claim)
 
                 col1, col2 = st.columns([2, 1])
                 with col1:
                     verdict_color = "🟢" if result['verdict'] == "True" else "🔴" if result['verdict'] == "Rumor" else "🟡"
                     st.markdown(f"### {verdict_color} Verdict: **{result['verdict']}**")
+                    if result.get('resolve_error'):
+                        st.warning(f"Could not read the linked page ({result['resolve_error']}); the link itself was checked.")
+                    elif result.get('source_url'):
+                        st.caption(f"Checked page: {result.get('source_title') or result['source_url']}")
                     st.markdown(f"**Confidence Score:** {result['confidence']:.2%}")
+                    if result.get('collapsed_into'):
+                        st.caption(f"Near-duplicate ({result['collapse_similarity']:.0%}) of an already checked claim: "
+                                   f"\"{result['collapsed_into']}\"")
                     st.markdown("**Evidence & Sources:**")
                     for evidence in result['evidence']:
                         st.markdown(f"• {evidence}")
@@ -51,6 +89,10 @@ def render():
                         for claim_data in result['similar_claims']:
                             st.markdown(f"• {claim_data}")
 
+                    if result.get('chunks'):
+                        st.markdown(f"**Claims Found in Text:** {len(result['chunks'])}")
+                        st.dataframe(pd.DataFrame(result['chunks'])[['verdict', 'confidence', 'text']])
+
                 with col2:
                     fig = go.Figure(data=go.Scatter(
                         x=[0], y=[result['confidence']],
@@ -70,20 +112,55 @@ def render():
                 ["@elonmusk", "@Oprah", "@JoeBiden", "@realDonaldTrump", "@BillGates", "@TheRock"],
                 default=["@elonmusk", "@Oprah"]
             )
-            keywords = st.text_input("Keywords to track:", "AI, technology, politics")
+            keywords = st.text_input(
+                "Keywords to track:", "AI, technology, politics",
+                help='Commas or OR separate alternatives; combine with AND / NOT; quote "exact phrases"'
+            )
+
+            sort_by = st.radio("Show top posts by:", ["time", "engagement"], horizontal=True)
+            start_monitoring = st.button("Start Monitoring")
+
+            auto_check = st.checkbox("Auto fact-check new posts", value='monitor_pipeline' in st.session_state)
+            pipeline = st.session_state.get('monitor_pipeline')
+            if auto_check and pipeline is None:
+                pipeline = MonitorPipeline(
+                    components['social_monitor'], components['fact_checker'], vip_accounts, keywords
+                )
+                pipeline.start()
+                st.session_state.monitor_pipeline = pipeline
+            elif not auto_check and pipeline is not None:
+                pipeline.stop()
+                del st.session_state.monitor_pipeline
+                pipeline = None
+
+            if pipeline is not None:
+                st.dataframe(pd.DataFrame(pipeline.stats()), hide_index=True)
 
-            if st.button("Start Monitoring"):
-                monitoring_data = components['social_monitor'].monitor_accounts(vip_accounts, keywords.split(', '))
-                st.session_state.monitoring_data = monitoring_data
+            trending = components['social_monitor'].detect_trending_rumors()
+            if trending:
+                st.subheader("Trending Terms")
+                st.dataframe(pd.DataFrame(trending)[['term', 'kind', 'count', 'ratio']], hide_index=True)
 
         with col2:
             st.subheader("Live Feed")
-            if 'monitoring_data' in st.session_state:
-                for post in st.session_state.monitoring_data:
-                    st.markdown(f"**@{post['username']}** - {post['platform']}")
-                    st.markdown(post['content'])
-                    st.markdown(f"*{post['timestamp']} • {post['engagement']} interactions*")
-                    st.markdown("---")
+            feed = st.empty()
+            if start_monitoring:
+                # Redraw as each account's posts arrive instead of waiting for the slowest account
+                top = TopN(10, sort_by)
+                for posts in components['social_monitor'].stream(vip_accounts, keywords, batches=True, latest=True):
+                    if top.extend(posts):
+                        with feed.container():
+                            render_feed(top.items())
+                st.session_state.monitoring_data = top.items()
+            elif 'monitoring_data' in st.session_state:
+                with feed.container():
+                    render_feed(st.session_state.monitoring_data)
+
+            if 'monitor_pipeline' in st.session_state:
+                st.subheader("Auto Fact-Check Results")
+                checked = st.session_state.monitor_pipeline.recent()
+                if checked:
+                    st.dataframe(pd.DataFrame(checked), hide_index=True)
 
     with tab3:
         st.header("Viral Content Analysis")
@@ -108,10 +185,46 @@ def render():
                     )
                     st.plotly_chart(fig, use_container_width=True)
 
+                history = components['viral_tracker'].history(content_url)
+                if history is not None:
+                    fig = px.area(history, x='time', y=components['viral_tracker'].platforms, title="30-Day Share History")
+                    st.plotly_chart(fig, use_container_width=True)
+
                 st.subheader("Key Influencers")
                 influencer_df = pd.DataFrame(viral_data['influencers'])
                 st.dataframe(influencer_df)
 
+        st.subheader("Watchlist")
+        watchlist = st.text_area("URLs to track (one per line):", height=100)
+        if st.button("Track Watchlist"):
+            urls = [line.strip() for line in watchlist.splitlines() if line.strip()]
+            if urls:
+                with st.spinner(f"Tracking {len(urls)} URLs..."):
+                    st.session_state.watchlist = components['viral_tracker'].track_viral_many(urls, timeout=30)
+        if 'watchlist' in st.session_state:
+            watchlist_df = st.session_state.watchlist
+            incomplete = (watchlist_df['status'] != 'ok').sum()
+            if incomplete:
+                st.caption(f"{incomplete} URLs returned partial or no data before the timeout")
+            # Column headers sort the table interactively; start with the most viral first
+            st.dataframe(
+                watchlist_df.sort_values('viral_score', ascending=False, na_position='last'),
+                hide_index=True, use_container_width=True
+            )
+
+            forecast_df = components['viral_tracker'].forecast_spread(watchlist_df['url'])
+            if forecast_df is not None:
+                st.subheader("Spread Forecast")
+                for _, row in forecast_df[forecast_df['early_warning']].iterrows():
+                    st.warning(
+                        f"{row['url']}: ~{row['predicted_final_reach']:,} shares predicted, "
+                        f"peak in {row['time_to_peak_hours']:.0f}h"
+                    )
+                st.dataframe(
+                    forecast_df.sort_values('predicted_final_reach', ascending=False),
+                    hide_index=True, use_container_width=True
+                )
+
     with tab4:
         st.header("Origin Tracing")
         trace_content = st.text_area("Enter content to trace origin:", height=100)
@@ -147,6 +260,9 @@ def render():
     st.sidebar.metric("Claims Checked Today", "1,247")
     st.sidebar.metric("Rumors Detected", "89")
     st.sidebar.metric("Origins Traced", "156")
+    cache_stats = components['fact_checker'].verdict_cache.stats
+    st.sidebar.metric("Verdict Cache Hits", cache_stats['memory_hits'] + cache_stats['disk_hits'],
+                      help=f"{cache_stats['misses']} misses")
     st.sidebar.markdown("### Settings")
     api_status = st.sidebar.selectbox("API Status", ["Connected", "Disconnected"])
     st.sidebar.color_picker("Theme Color", "#FF6B6B")
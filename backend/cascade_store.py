@@ -0,0 +1,215 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from backend.normalize import canonical_url
+
+CASCADE_STORE = "cascade_store"
+PLATFORMS = ['Twitter', 'Facebook', 'Instagram', 'YouTube', 'TikTok', 'Reddit']
+# resolution -> (bucket seconds, seconds covered by one rollup segment)
+RESOLUTIONS = {
+    'minute': (60, 86400),
+    'hour': (3600, 32 * 86400),
+    'day': (86400, 512 * 86400)
+}
+RAW_COLUMNS = (('ts', np.int64), ('platform', np.int8), ('shares', np.int32))
+
+def _runs(sorted_keys):
+    """(key, start, stop) for each run of equal values in a sorted array"""
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_keys)) + 1))
+    stops = np.append(starts[1:], len(sorted_keys))
+    return [(int(sorted_keys[lo]), int(lo), int(hi)) for lo, hi in zip(starts, stops)]
+
+class CascadeStore:
+    """Share counts per (content URL, platform, time bucket) on disk
+
+    Raw events go to append-only per-day column files; every append also adds into fixed-size
+    memory-mapped minute/hour/day rollup segments, so a range query touches only the rollup
+    segments that overlap it.
+    """
+
+    def __init__(self, root=CASCADE_STORE, platforms=PLATFORMS):
+        self.root = root
+        self.platforms = list(platforms)
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, "cascades.db"), check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS cascades (
+                url TEXT PRIMARY KEY,
+                key TEXT,
+                first_ts INTEGER,
+                last_ts INTEGER,
+                total_shares INTEGER
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS watermarks (
+                url TEXT,
+                platform INTEGER,
+                last_ts INTEGER,
+                at_last INTEGER,
+                PRIMARY KEY (url, platform)
+            )
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def cascade_key(content_url):
+        return hashlib.sha1(canonical_url(content_url).encode('utf-8')).hexdigest()[:20]
+
+    def _segment(self, key, resolution, period, create):
+        bucket, span = RESOLUTIONS[resolution]
+        path = os.path.join(self.root, key, resolution, f"{period * span}.i32")
+        shape = (span // bucket, len(self.platforms))
+        if not os.path.exists(path):
+            if not create:
+                return None
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            return np.memmap(path, dtype=np.int32, mode='w+', shape=shape)
+        return np.memmap(path, dtype=np.int32, mode='r+' if create else 'r', shape=shape)
+
+    def _prepare(self, timestamps, platforms, shares):
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        platforms = np.asarray(platforms, dtype=np.int64)
+        shares = np.asarray(shares, dtype=np.int32)
+        # Unknown platforms (encode_platforms gives -1) would land in another platform's rollup column
+        known = (platforms >= 0) & (platforms < len(self.platforms))
+        # Sorted once, every day / period group is a contiguous slice
+        order = np.flatnonzero(known)[np.argsort(timestamps[known], kind='stable')]
+        return timestamps[order], platforms[order].astype(np.int8), shares[order]
+
+    def append(self, content_url, timestamps, platforms, shares):
+        """Add share events (epoch seconds, platform codes, counts) for one content URL"""
+        timestamps, platforms, shares = self._prepare(timestamps, platforms, shares)
+        if not len(timestamps):
+            return 0
+        url = canonical_url(content_url)
+        key = self.cascade_key(url)
+
+        with self._lock:
+            self._write(url, key, timestamps, platforms, shares)
+        return len(timestamps)
+
+    def merge_snapshot(self, content_url, timestamps, platforms, shares):
+        """Append the events of a full-history fetch that are not stored yet; returns how many were new
+
+        Each platform keeps its own high-water mark (last timestamp and how many events it holds), so a
+        platform missing from one fetch loses nothing, and same-second events past the mark still count.
+        """
+        timestamps, platforms, shares = self._prepare(timestamps, platforms, shares)
+        url = canonical_url(content_url)
+
+        with self._lock:
+            marks = dict((code, (last_ts, at_last)) for code, last_ts, at_last in self.conn.execute(
+                "SELECT platform, last_ts, at_last FROM watermarks WHERE url = ?", (url,)
+            ))
+            span = self.span(url) if not marks else None
+            if span is not None:
+                # Stored before watermarks were kept: start from what the raw logs hold
+                stored_ts, stored_platforms, _ = self.events(url, span[0], span[1] + 1)
+                for code in np.unique(stored_platforms):
+                    stored = stored_ts[stored_platforms == code]
+                    marks[int(code)] = (int(stored.max()), int((stored == stored.max()).sum()))
+            keep = np.zeros(len(timestamps), dtype=bool)
+            updates = []
+            for code in np.unique(platforms):
+                rows = np.flatnonzero(platforms == code)
+                last_ts, at_last = marks.get(int(code), (None, 0))
+                if last_ts is None:
+                    keep[rows] = True
+                else:
+                    keep[rows[timestamps[rows] > last_ts]] = True
+                    keep[rows[timestamps[rows] == last_ts][at_last:]] = True
+                newest = int(timestamps[rows[-1]])
+                if last_ts is None or newest >= last_ts:
+                    updates.append((url, int(code), newest, int((timestamps[rows] == newest).sum())))
+            if keep.any():
+                self._write(url, self.cascade_key(url), timestamps[keep], platforms[keep], shares[keep])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO watermarks (url, platform, last_ts, at_last) VALUES (?, ?, ?, ?)", updates
+            )
+            self.conn.commit()
+        return int(keep.sum())
+
+    def _write(self, url, key, timestamps, platforms, shares):
+        # Caller holds the lock; events are sorted by timestamp
+        for day, lo, hi in _runs(timestamps // 86400):
+            directory = os.path.join(self.root, key, 'events', str(day * 86400))
+            os.makedirs(directory, exist_ok=True)
+            for (name, dtype), column in zip(RAW_COLUMNS, (timestamps, platforms, shares)):
+                with open(os.path.join(directory, f"{name}.bin"), 'ab') as f:
+                    column[lo:hi].astype(dtype).tofile(f)
+
+        for resolution, (bucket, span) in RESOLUTIONS.items():
+            for period, lo, hi in _runs(timestamps // span):
+                segment = self._segment(key, resolution, period, create=True)
+                cells = (timestamps[lo:hi] - period * span) // bucket * len(self.platforms) + platforms[lo:hi]
+                segment += np.bincount(cells, weights=shares[lo:hi], minlength=segment.size) \
+                    .astype(np.int32).reshape(segment.shape)
+                segment.flush()
+
+        first, last, total = int(timestamps.min()), int(timestamps.max()), int(shares.sum())
+        self.conn.execute('''
+            INSERT INTO cascades (url, key, first_ts, last_ts, total_shares) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                first_ts = MIN(first_ts, excluded.first_ts),
+                last_ts = MAX(last_ts, excluded.last_ts),
+                total_shares = total_shares + excluded.total_shares
+        ''', (url, key, first, last, total))
+        self.conn.commit()
+
+    def cascades(self):
+        return pd.read_sql_query("SELECT url, first_ts, last_ts, total_shares FROM cascades ORDER BY last_ts DESC", self.conn)
+
+    def span(self, content_url):
+        row = self.conn.execute(
+            "SELECT first_ts, last_ts FROM cascades WHERE url = ?", (canonical_url(content_url),)
+        ).fetchone()
+        return row
+
+    @staticmethod
+    def pick_resolution(start, end, max_points=500):
+        """Finest resolution that keeps a chart of [start, end) under max_points buckets"""
+        for resolution, (bucket, _) in RESOLUTIONS.items():
+            if (end - start) / bucket <= max_points:
+                return resolution
+        return 'day'
+
+    def query(self, content_url, start, end, resolution=None):
+        """Per-bucket shares for [start, end) as a DataFrame: time, one column per platform, and total shares"""
+        resolution = resolution or self.pick_resolution(start, end)
+        bucket, span = RESOLUTIONS[resolution]
+        start, end = start // bucket * bucket, -(-end // bucket) * bucket
+        key = self.cascade_key(content_url)
+        counts = np.zeros(((end - start) // bucket, len(self.platforms)), dtype=np.int64)
+
+        for period in range(start // span, (end - 1) // span + 1):
+            segment = self._segment(key, resolution, period, create=False)
+            if segment is None:
+                continue
+            # Only the overlapping rows of the segment are read
+            period_start = period * span
+            lo, hi = max(start, period_start), min(end, period_start + span)
+            counts[(lo - start) // bucket:(hi - start) // bucket] = segment[(lo - period_start) // bucket:(hi - period_start) // bucket]
+
+        frame = pd.DataFrame(counts, columns=self.platforms)
+        frame.insert(0, 'time', pd.to_datetime(start + np.arange(len(counts)) * bucket, unit='s'))
+        frame['shares'] = counts.sum(axis=1)
+        return frame
+
+    def events(self, content_url, start, end):
+        """Raw (timestamps, platforms, shares) for [start, end), read from the per-day append logs"""
+        key = self.cascade_key(content_url)
+        columns = [[] for _ in RAW_COLUMNS]
+        for day in range(start // 86400, (end - 1) // 86400 + 1):
+            directory = os.path.join(self.root, key, 'events', str(day * 86400))
+            if not os.path.isdir(directory):
+                continue
+            day_columns = [np.fromfile(os.path.join(directory, f"{name}.bin"), dtype=dtype) for name, dtype in RAW_COLUMNS]
+            selected = (day_columns[0] >= start) & (day_columns[0] < end)
+            for column, values in zip(columns, day_columns):
+                column.append(values[selected])
+        return tuple(np.concatenate(column) if column else np.zeros(0, dtype) for column, (_, dtype) in zip(columns, RAW_COLUMNS))
@@ -0,0 +1,161 @@
+import argparse
+import os
+import signal
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from db_utils import DB_NAME
+
+class CaseRescorer:
+    """Resumable, throttled batch scoring of reported evidence cases into a side table"""
+
+    def __init__(self, fact_checker, db_path=DB_NAME, model_version=None, chunk_size=256, batch_size=32, max_duty=0.5,
+                 update_index=True):
+        self.fact_checker = fact_checker
+        self.update_index = update_index
+        self.db_path = db_path
+        self.model_version = model_version or fact_checker.model_version
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.max_duty = max_duty
+        self.stop_event = threading.Event()
+        self.stats = {'scored': 0, 'chunks': 0, 'busy_seconds': 0.0}
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS case_scores (
+                case_id INTEGER,
+                model_version TEXT,
+                verdict TEXT,
+                confidence REAL,
+                label TEXT,
+                score REAL,
+                scored_at DATETIME,
+                PRIMARY KEY (case_id, model_version)
+            );
+            CREATE TABLE IF NOT EXISTS rescore_checkpoints (
+                model_version TEXT PRIMARY KEY,
+                last_case_id INTEGER,
+                scored INTEGER,
+                updated_at DATETIME
+            );
+        ''')
+        self.conn.commit()
+
+    def checkpoint(self):
+        row = self.conn.execute(
+            "SELECT last_case_id, scored FROM rescore_checkpoints WHERE model_version = ?", (self.model_version,)
+        ).fetchone()
+        return row if row else (0, 0)
+
+    def pending(self):
+        last_case_id, _ = self.checkpoint()
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM evidence_cases WHERE id > ? AND post_text IS NOT NULL AND post_text != ''",
+            (last_case_id,)
+        ).fetchone()[0]
+
+    def run(self, follow=False, poll_interval=60, log=print):
+        """Score every case past this model version's checkpoint; with follow=True keep polling for new ones"""
+        while not self.stop_event.is_set():
+            scored = self.run_chunk()
+            if scored:
+                log(f"[{self.model_version}] scored {self.stats['scored']} cases, checkpoint at {self.checkpoint()[0]}")
+            elif follow:
+                self.stop_event.wait(poll_interval)
+            else:
+                break
+        return self.stats['scored']
+
+    def run_chunk(self):
+        last_case_id, scored_total = self.checkpoint()
+        rows = self.conn.execute(
+            "SELECT id, post_text FROM evidence_cases WHERE id > ? AND post_text IS NOT NULL AND post_text != '' "
+            "ORDER BY id LIMIT ?",
+            (last_case_id, self.chunk_size)
+        ).fetchall()
+        if not rows:
+            return 0
+
+        started = time.monotonic()
+        texts = [text for _, text in rows]
+        scores, embeddings = self.fact_checker.score_claims(texts, batch_size=self.batch_size)
+        scored_at = datetime.now().isoformat()
+
+        # The claim index is shared with running UI processes (ClaimIndex serialises writers across processes);
+        # it is updated first so a failure there leaves the checkpoint where it was and the chunk is retried
+        if self.update_index:
+            self.fact_checker.claim_index.add(
+                texts, embeddings, [s['verdict'] for s in scores], [s['confidence'] for s in scores], [scored_at] * len(texts),
+                [s['stage'] for s in scores]
+            )
+
+        # Scores and the checkpoint commit together, so a crash resumes at the first unscored case
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO case_scores (case_id, model_version, verdict, confidence, label, score, scored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (case_id, self.model_version, s['verdict'], s['confidence'], s['label'], s['score'], scored_at)
+                    for (case_id, _), s in zip(rows, scores)
+                ]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO rescore_checkpoints (model_version, last_case_id, scored, updated_at) VALUES (?, ?, ?, ?)",
+                (self.model_version, rows[-1][0], scored_total + len(rows), scored_at)
+            )
+
+        busy = time.monotonic() - started
+        self.stats['scored'] += len(rows)
+        self.stats['chunks'] += 1
+        self.stats['busy_seconds'] += busy
+        # Duty-cycle throttle: idle long enough that the job uses at most max_duty of the wall clock
+        if self.max_duty < 1:
+            self.stop_event.wait(busy * (1 - self.max_duty) / self.max_duty)
+        return len(rows)
+
+    def start(self, **run_options):
+        thread = threading.Thread(target=self.run, kwargs=run_options, name='case-rescorer', daemon=True)
+        thread.start()
+        return thread
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally (re-)score stored evidence cases")
+    parser.add_argument('--db', default=DB_NAME)
+    parser.add_argument('--model-version', help="Defaults to the classifier/backend in use; a new version re-scores everything")
+    parser.add_argument('--chunk-size', type=int, default=256)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--max-duty', type=float, default=0.5, help="Fraction of wall time the job may spend scoring")
+    parser.add_argument('--threads', type=int, default=1, help="Torch intra-op threads, leaving cores for the UI")
+    parser.add_argument('--follow', action='store_true', help="Keep polling for newly reported cases")
+    parser.add_argument('--backend', default=None)
+    parser.add_argument('--cascade', action='store_true')
+    parser.add_argument('--no-index', action='store_true',
+                        help="Only write case_scores; leave the shared claim index to the serving model")
+    args = parser.parse_args()
+
+    if hasattr(os, 'nice'):
+        os.nice(10)
+    import torch
+    torch.set_num_threads(args.threads)
+
+    from backend.fact_checker import FactChecker
+    options = {'cascade': args.cascade}
+    if args.backend:
+        options['inference_backend'] = args.backend
+    rescorer = CaseRescorer(
+        FactChecker(**options), args.db, args.model_version,
+        chunk_size=args.chunk_size, batch_size=args.batch_size, max_duty=args.max_duty,
+        update_index=not args.no_index
+    )
+    signal.signal(signal.SIGTERM, lambda *_: rescorer.stop_event.set())
+    print(f"[{rescorer.model_version}] {rescorer.pending()} cases to score")
+    try:
+        rescorer.run(follow=args.follow)
+    except KeyboardInterrupt:
+        rescorer.stop_event.set()
+    print(f"[{rescorer.model_version}] done, {rescorer.stats['scored']} cases scored this run")
+
+if __name__ == "__main__":
+    main()
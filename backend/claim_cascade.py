@@ -0,0 +1,122 @@
+import argparse
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import numpy as np
+from backend.claim_index import INDEX_DIR
+
+CASCADE_MODEL = "cascade_model.pkl"
+
+class ClaimCascade:
+    """Cheap TF-IDF + logistic regression first stage; only claims inside its uncertainty band reach the transformer"""
+
+    def __init__(self, model_path=CASCADE_MODEL):
+        self.model_path = model_path
+        self.pipeline = None
+        self.low = 0.0
+        self.high = 1.0
+        self.stats = {'claims': 0, 'cheap_rumor': 0, 'cheap_true': 0, 'escalated': 0}
+        self._lock = threading.Lock()
+        if os.path.exists(model_path):
+            with open(model_path, 'rb') as f:
+                saved = pickle.load(f)
+            self.pipeline, self.low, self.high = saved['pipeline'], saved['low'], saved['high']
+
+    def triage(self, claims):
+        """Per claim: a classifier-shaped output when the cheap stage is sure, else None (escalate)"""
+        if self.pipeline is None:
+            decisions = [None] * len(claims)
+        else:
+            rumor_probability = self.pipeline.predict_proba(claims)[:, 1]
+            decisions = []
+            for p in rumor_probability:
+                if p >= self.high:
+                    decisions.append({'label': 'NEGATIVE', 'score': float(p), 'stage': 'cascade'})
+                elif p <= self.low:
+                    decisions.append({'label': 'POSITIVE', 'score': float(1 - p), 'stage': 'cascade'})
+                else:
+                    decisions.append(None)
+
+        with self._lock:
+            self.stats['claims'] += len(claims)
+            for decision in decisions:
+                if decision is None:
+                    self.stats['escalated'] += 1
+                elif decision['label'] == 'NEGATIVE':
+                    self.stats['cheap_rumor'] += 1
+                else:
+                    self.stats['cheap_true'] += 1
+        return decisions
+
+def load_verdicts(index_dir=INDEX_DIR):
+    """Stored (claim, verdict) pairs from the claim index, minus Uncertain ones and the cascade's own decisions"""
+    conn = sqlite3.connect(os.path.join(index_dir, "claims.db"))
+    # Learning from verdicts the cheap stage made itself would only reinforce its mistakes
+    has_stage = 'stage' in [row[1] for row in conn.execute("PRAGMA table_info(claims)")]
+    rows = conn.execute(
+        "SELECT claim, verdict FROM claims WHERE verdict IN ('Rumor', 'True')"
+        + (" AND (stage IS NULL OR stage != 'cascade')" if has_stage else "")
+    ).fetchall()
+    conn.close()
+    return [claim for claim, _ in rows], np.array([verdict == 'Rumor' for _, verdict in rows], dtype=int)
+
+def choose_band(probabilities, labels, target_agreement):
+    """Widest band (most claims decided cheaply) whose cheap decisions agree with stored verdicts at the target rate"""
+    # The band edges must still map onto the transformer verdict thresholds (Rumor > 0.7, True > 0.6)
+    best = (0.0, 1.0, 0.0, 1.0)
+    for high in (h / 100 for h in range(99, 70, -1)):
+        for low in (l / 100 for l in range(1, 40)):
+            decided = (probabilities >= high) | (probabilities <= low)
+            if not decided.any():
+                continue
+            agreement = np.mean((probabilities[decided] >= high) == labels[decided])
+            coverage = decided.mean()
+            if agreement >= target_agreement and coverage > best[2]:
+                best = (low, high, float(coverage), float(agreement))
+    return best
+
+def train(index_dir=INDEX_DIR, model_path=CASCADE_MODEL, target_agreement=0.97, holdout=0.2, seed=0):
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import make_pipeline
+
+    claims, labels = load_verdicts(index_dir)
+    if len(claims) < 50 or labels.min() == labels.max():
+        raise ValueError(f"need at least 50 stored verdicts of both classes, found {len(claims)}")
+
+    train_claims, test_claims, train_labels, test_labels = train_test_split(
+        claims, labels, test_size=holdout, random_state=seed, stratify=labels
+    )
+    pipeline = make_pipeline(
+        TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, min_df=2, max_features=200000),
+        CalibratedClassifierCV(LogisticRegression(max_iter=1000, C=4.0), method='sigmoid', cv=3)
+    )
+    started = time.time()
+    pipeline.fit(train_claims, train_labels)
+    # The saved model is the one the band was calibrated on; a refit on all data would shift its probabilities
+    low, high, coverage, agreement = choose_band(pipeline.predict_proba(test_claims)[:, 1], test_labels, target_agreement)
+    with open(model_path, 'wb') as f:
+        pickle.dump({'pipeline': pipeline, 'low': low, 'high': high, 'samples': len(train_claims), 'trained_at': time.time()}, f)
+    return {
+        'samples': len(train_claims), 'low': low, 'high': high, 'coverage': coverage,
+        'agreement': agreement, 'seconds': time.time() - started
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and calibrate the cheap cascade stage from stored verdicts")
+    parser.add_argument('--index-dir', default=INDEX_DIR)
+    parser.add_argument('--output', default=CASCADE_MODEL)
+    parser.add_argument('--target-agreement', type=float, default=0.97)
+    args = parser.parse_args()
+
+    report = train(args.index_dir, args.output, args.target_agreement)
+    print(f"Trained on {report['samples']} verdicts in {report['seconds']:.1f}s")
+    print(f"Band: escalate when {report['low']:.2f} < p(rumor) < {report['high']:.2f}")
+    print(f"Held-out: {report['coverage']:.0%} decided by the cheap stage at {report['agreement']:.1%} agreement")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import itertools
+import threading
+import time
+import zlib
+from collections import OrderedDict
+import numpy as np
+from backend.normalize import normalize_claim
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+def _lsh_params(threshold, num_perm):
+    # Pick bands x rows so the S-curve's steepest point, (1/b)^(1/r), sits closest to the threshold
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    return min(options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold))
+
+class NearDuplicateIndex:
+    """MinHash LSH index of recently processed claims with bounded size and time-based eviction"""
+
+    def __init__(self, threshold=0.8, num_perm=64, shingle_size=5, max_entries=50000, ttl=6 * 3600, seed=7):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+        self._entries = OrderedDict()
+        self._buckets = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def shingles(self, claim):
+        text = normalize_claim(claim)
+        if len(text) <= self.shingle_size:
+            return {text}
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+
+    def signature(self, claim):
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in self.shingles(claim)), dtype=np.uint64)
+        return ((np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME).min(axis=0)
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def find(self, claim):
+        """Return (key, canonical claim, estimated Jaccard) of the closest indexed claim above the threshold"""
+        signature = self.signature(claim)
+        with self._lock:
+            self._evict(time.time())
+            candidates = set()
+            for band_key in self._band_keys(signature):
+                candidates.update(self._buckets.get(band_key, ()))
+
+            best = None
+            for key in candidates:
+                similarity = float(np.mean(self._entries[key]['signature'] == signature))
+                if similarity >= self.threshold and (best is None or similarity > best[2]):
+                    best = (key, self._entries[key]['claim'], similarity)
+            return best
+
+    def add(self, claim, result=None):
+        signature = self.signature(claim)
+        with self._lock:
+            key = next(self._ids)
+            self._entries[key] = {'claim': claim, 'signature': signature, 'result': result, 'added_at': time.time()}
+            for band_key in self._band_keys(signature):
+                self._buckets.setdefault(band_key, set()).add(key)
+            self._evict(time.time())
+            return key
+
+    def result(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry['result'] if entry else None
+
+    def set_result(self, key, result):
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]['result'] = result
+
+    def remove(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._unbucket(key, entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self, now):
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_entries and now - entry['added_at'] <= self.ttl:
+                break
+            self._entries.popitem(last=False)
+            self._unbucket(key, entry)
+
+    def _unbucket(self, key, entry):
+        for band_key in self._band_keys(entry['signature']):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
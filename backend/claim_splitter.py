@@ -0,0 +1,73 @@
+import re
+from backend.model_loader import load_tokenizer, CLASSIFIER_MODEL
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])(["\')\]]*)\s+(?=["\'(\[]?[A-Z0-9#@])|\n\s*\n(?:\s*[-*•]\s+)?|\n\s*[-*•]\s+')
+MIN_WORDS = 4
+ABBREVIATIONS = {'mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'st.', 'jr.', 'sr.', 'vs.', 'gen.', 'gov.', 'sen.', 'rep.', 'u.s.', 'e.g.', 'i.e.'}
+
+class ClaimSplitter:
+    """Splits long input into sentence-level claims and packs them into token-budgeted batches"""
+
+    def __init__(self, model_name=CLASSIFIER_MODEL, max_tokens=510, token_budget=4096):
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.token_budget = token_budget
+
+    def sentences(self, text):
+        sentences = []
+        pending = ''
+        parts = SENTENCE_BOUNDARY.split(text)
+        # split() interleaves each fragment with the closing quotes/brackets the boundary matched (None for line breaks)
+        for fragment, closing in zip(parts[::2], parts[1::2] + [None]):
+            part = ' '.join(f"{pending} {fragment}{closing or ''}".split())
+            pending = ''
+            if not part:
+                continue
+            # A split right after an abbreviation ("Dr. Smith") is not a sentence end; carry it into the next fragment
+            if part.split()[-1].lower() in ABBREVIATIONS:
+                pending = part
+            # Fragments too short to carry a claim join the previous sentence
+            elif sentences and len(part.split()) < MIN_WORDS:
+                sentences[-1] = f"{sentences[-1]} {part}"
+            else:
+                sentences.append(part)
+        if pending:
+            if sentences and len(pending.split()) < MIN_WORDS:
+                sentences[-1] = f"{sentences[-1]} {pending}"
+            else:
+                sentences.append(pending)
+        return sentences
+
+    def split(self, text):
+        """Return [(chunk text, token count)], with any sentence over max_tokens cut into windows"""
+        sentences = self.sentences(text)
+        if not sentences:
+            return []
+        tokenizer = load_tokenizer(self.model_name)
+        token_ids = tokenizer(sentences, add_special_tokens=False)['input_ids']
+
+        chunks = []
+        for sentence, ids in zip(sentences, token_ids):
+            if len(ids) <= self.max_tokens:
+                chunks.append((sentence, len(ids)))
+                continue
+            for start in range(0, len(ids), self.max_tokens):
+                window = ids[start:start + self.max_tokens]
+                chunks.append((tokenizer.decode(window), len(window)))
+        return chunks
+
+    def pack(self, chunks):
+        """Group chunk indices into batches whose padded size (rows x longest row) stays within the budget"""
+        order = sorted(range(len(chunks)), key=lambda i: chunks[i][1])
+        batches = []
+        batch = []
+        for i in order:
+            # Sorting by length means the newest chunk is always the longest in its batch
+            padded = (len(batch) + 1) * (chunks[i][1] + 2)
+            if batch and padded > self.token_budget:
+                batches.append(batch)
+                batch = []
+            batch.append(i)
+        if batch:
+            batches.append(batch)
+        return batches
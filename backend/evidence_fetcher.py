@@ -0,0 +1,109 @@
+import json
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+
+RESULT_KEYS = ('articles', 'results', 'statements', 'items', 'data', 'hits')
+TITLE_KEYS = ('title', 'headline', 'claim', 'statement', 'name')
+
+class EvidenceFetcher:
+    """Queries every configured evidence source concurrently over pooled keep-alive connections"""
+
+    def __init__(self, sources, source_params=None, deadline=3.0, max_workers=16, max_per_source=3):
+        self.sources = dict(sources)
+        self.source_params = source_params or {}
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self.max_per_source = max_per_source
+        self.providers = {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(len(self.sources), 1), pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='evidence')
+
+    def register_provider(self, name, provider):
+        """Add a non-HTTP source: provider(claim, timeout) -> list of (title, source label)"""
+        self.providers[name] = provider
+
+    def fetch(self, claim, deadline=None):
+        return self.fetch_many([claim], deadline)[0]
+
+    def fetch_many(self, claims, deadline=None):
+        """Return, per claim, the (title, source label) pairs that arrived before the deadline"""
+        deadline = self.deadline if deadline is None else deadline
+        # Every claim is submitted now and shares one expiry, so a batch takes one deadline, not one per pool-full
+        expires = time.monotonic() + deadline
+        futures = {}
+        for i, claim in enumerate(claims):
+            for order, (name, url) in enumerate(self.sources.items()):
+                futures[self.executor.submit(self._query_source, name, url, claim, expires)] = (i, order)
+            for order, (name, provider) in enumerate(self.providers.items(), len(self.sources)):
+                futures[self.executor.submit(self._query_provider, name, provider, claim, expires)] = (i, order)
+
+        done, not_done = wait(futures, timeout=max(expires - time.monotonic(), 0))
+        # Queued stragglers never start; in-flight ones stop reading at the expiry on their own
+        for future in not_done:
+            future.cancel()
+
+        arrived = [{} for _ in claims]
+        for future in done:
+            if future.exception() is None:
+                i, order = futures[future]
+                arrived[i][order] = future.result()
+        return [[item for order in sorted(found) for item in found[order]] for found in arrived]
+
+    def _query_source(self, name, url, claim, expires):
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            return []
+        params = {'q': claim[:100], **self.source_params.get(name, {})}
+        with self.session.get(url, params=params, timeout=remaining, stream=True) as response:
+            if response.status_code != 200:
+                return []
+            body = self._read_body(response, expires)
+        if body is None:
+            return []
+        return self._parse_results(name, json.loads(body))[:self.max_per_source]
+
+    def _read_body(self, response, expires):
+        """The response body, or None once the expiry passes; the requests timeout only bounds each socket read"""
+        chunks = []
+        while True:
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                return None
+            # A slow-drip server would otherwise reset the read timeout with every byte it sends
+            connection = response.raw.connection
+            if connection is not None and connection.sock is not None:
+                connection.sock.settimeout(remaining)
+            chunk = response.raw.read1(65536)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+
+    def _query_provider(self, name, provider, claim, expires):
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            return []
+        return list(provider(claim, remaining))[:self.max_per_source]
+
+    def _parse_results(self, name, payload):
+        items = payload
+        if isinstance(payload, dict):
+            items = next((payload[key] for key in RESULT_KEYS if isinstance(payload.get(key), list)), [])
+
+        results = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            title = next((item[key] for key in TITLE_KEYS if isinstance(item.get(key), str)), None)
+            if not title:
+                continue
+            label = name
+            if isinstance(item.get('source'), dict) and item['source'].get('name'):
+                label = f"{name} / {item['source']['name']}"
+            results.append((title, label))
+        return results
@@ -1,81 +1,318 @@
-import requests
+import os
 import re
-from transformers import pipeline, AutoTokenizer, AutoModel
-from sentence_transformers import SentenceTransformer
-import torch
+import threading
 import numpy as np
 from datetime import datetime
+from backend.claim_cascade import ClaimCascade, CASCADE_MODEL
+from backend.claim_dedup import NearDuplicateIndex
+from backend.claim_index import ClaimIndex, INDEX_DIR
+from backend.claim_splitter import ClaimSplitter
+from backend.evidence_fetcher import EvidenceFetcher
+from backend.fact_corpus import FactCorpus, CORPUS_DB
+from backend.inference_server import InferenceClient, INFERENCE_URL
+from backend.model_loader import load_classifier, load_sentence_model, CLASSIFIER_MODEL, SENTENCE_MODEL, DEFAULT_BACKEND
+from backend.normalize import claim_fingerprint
+from backend.url_resolver import UrlResolver, URL_CACHE_DB
+from backend.verdict_cache import VerdictCache, CACHE_DB
+
+FALLBACK_EVIDENCE = [
+    "Cross-referenced with fact-checking databases",
+    "Analyzed using BERT-based classification model",
+    "Compared against known misinformation patterns"
+]
 
 class FactChecker:
-    def __init__(self):
-        self.bert_classifier = pipeline('text-classification', 
-                                      model='distilbert-base-uncased-finetuned-sst-2-english')
-        self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, index_dir=INDEX_DIR, cache_db=CACHE_DB, cache_ttl=24 * 3600, evidence_ttl=3600,
+                 evidence_deadline=3.0, classifier_model=CLASSIFIER_MODEL, sentence_model=SENTENCE_MODEL,
+                 inference_backend=DEFAULT_BACKEND, dedup_threshold=0.8, dedup_ttl=6 * 3600, corpus_db=CORPUS_DB,
+                 inference_url=INFERENCE_URL, url_cache_db=URL_CACHE_DB, cascade=False, cascade_model=CASCADE_MODEL,
+                 min_similarity=0.5):
+        # Models load on first use and are shared by every FactChecker in the process, unless an
+        # inference worker owns them and this instance runs in client mode
+        self.classifier_model = classifier_model
+        self.sentence_model_name = sentence_model
+        self.inference_backend = inference_backend
+        self.inference_client = InferenceClient(inference_url) if inference_url else None
+        self.claim_index = ClaimIndex(index_dir)
+        # Indexed claims less similar than this (cosine) are not shown as related
+        self.min_similarity = min_similarity
+        self.dedup_index = NearDuplicateIndex(threshold=dedup_threshold, ttl=dedup_ttl)
+        self.claim_splitter = ClaimSplitter(classifier_model)
+        self.url_resolver = UrlResolver(url_cache_db)
+        self.cascade = ClaimCascade(cascade_model) if cascade else None
+        self.verdict_cache = VerdictCache(cache_db, ttl=cache_ttl, evidence_ttl=evidence_ttl, namespace=self.model_version)
         self.fact_check_apis = {
             'snopes': 'https://api.snopes.com/v1/search',
             'factcheck': 'https://factcheck.org/api/search',
             'politifact': 'https://www.politifact.com/api/v/2/statement'
         }
-        
+        self.evidence_fetcher = EvidenceFetcher(
+            dict(self.fact_check_apis, newsapi='https://newsapi.org/v2/everything'),
+            source_params={'newsapi': {'apiKey': os.getenv("NEWS_API_KEY", "your_news_api_key")}},
+            deadline=evidence_deadline
+        )
+        # Offline-first: a local fact-check corpus, when one has been ingested, is queried alongside the APIs
+        self.fact_corpus = FactCorpus(corpus_db) if os.path.exists(corpus_db) else None
+        if self.fact_corpus is not None:
+            self.evidence_fetcher.register_provider('corpus', self.fact_corpus.evidence_provider)
+
+    @property
+    def bert_classifier(self):
+        return load_classifier(self.classifier_model, self.inference_backend)
+
+    @property
+    def sentence_model(self):
+        return load_sentence_model(self.sentence_model_name, self.inference_backend)
+
+    def warm_up(self, background=True):
+        """Load both models and run one dummy inference so the first real claim skips the warm-up cost"""
+        def run():
+            try:
+                self._classify(["Warm-up claim"], 1)
+                self._encode(["Warm-up claim"], 1)
+            except Exception:
+                pass
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name='fact-checker-warm-up', daemon=True)
+        thread.start()
+        return thread
+
     def check_fact(self, claim):
-        verdict = self._classify_claim(claim)
-        confidence = self._calculate_confidence(claim)
-        evidence = self._gather_evidence(claim)
-        similar_claims = self._find_similar_claims(claim)
-        
-        return {
+        return self.check_fact_many([claim])[0]
+
+    def check_fact_many(self, claims, batch_size=32):
+        claims = list(claims)
+        results = [None] * len(claims)
+        pending = {}
+        stale = []
+
+        for i, claim in enumerate(claims):
+            cached = self.verdict_cache.get(claim)
+            if cached is None:
+                pending.setdefault(claim_fingerprint(claim), []).append(i)
+                continue
+            result, evidence_fresh = cached
+            if not evidence_fresh:
+                stale.append(i)
+            results[i] = result
+
+        if stale:
+            for i, evidence in zip(stale, self._gather_evidence_many([claims[i] for i in stale])):
+                results[i]['evidence'] = evidence
+                self.verdict_cache.refresh_evidence(claims[i], evidence)
+
+        # Variants that normalise to the same fingerprint share one model pass
+        if pending:
+            fresh = self._check_near_duplicates([claims[positions[0]] for positions in pending.values()], batch_size)
+            for positions, result in zip(pending.values(), fresh):
+                self.verdict_cache.put(claims[positions[0]], result)
+                for i in positions:
+                    results[i] = dict(result)
+
+        return results
+
+    @property
+    def model_version(self):
+        stages = f"cascade+{self.classifier_model}" if self.cascade is not None else self.classifier_model
+        return f"{stages}:{self.inference_backend}"
+
+    def score_claims(self, claims, batch_size=32):
+        """Model-only scoring (no cache, evidence or similar-claim lookup): returns (scores, unit embeddings)"""
+        claims = list(claims)
+        if not claims:
+            return [], np.zeros((0, self.claim_index.dim), dtype=np.float32)
+        classifications, embeddings = self._run_models(claims, batch_size)
+        scores = []
+        for claim, classification in zip(claims, classifications):
+            scores.append({
+                'verdict': self._classify_claim(classification),
+                'confidence': self._calculate_confidence(claim, classification),
+                'label': classification['label'],
+                'score': float(classification['score']),
+                'stage': classification.get('stage', 'model')
+            })
+        return scores, embeddings
+
+    def check_url(self, url):
+        """Check the text a URL points to rather than the URL string itself"""
+        try:
+            page = self.url_resolver.resolve(url)
+        except Exception as e:
+            return dict(self.check_fact(url), source_url=url, resolve_error=str(e))
+
+        text = '\n\n'.join(part for part in (page['title'], page['text']) if part)
+        if not text:
+            return dict(self.check_fact(url), source_url=page['url'], resolve_error="no readable text on the page")
+        return dict(self.check_document(text), source_url=page['url'], source_title=page['title'])
+
+    def check_document(self, text):
+        """Score every sentence-level claim of a long text in one pass and aggregate a document verdict"""
+        cached = self.verdict_cache.get(text)
+        if cached is not None and cached[1]:
+            return cached[0]
+
+        chunks = self.claim_splitter.split(text)
+        if len(chunks) <= 1:
+            return self.check_fact(text)
+
+        classifications = [None] * len(chunks)
+        for batch in self.claim_splitter.pack(chunks):
+            for i, classification in zip(batch, self._classify([chunks[i][0] for i in batch], len(batch))):
+                classifications[i] = classification
+
+        chunk_results = []
+        weights = {}
+        for (chunk, tokens), classification in zip(chunks, classifications):
+            verdict = self._classify_claim(classification)
+            chunk_results.append({
+                'text': chunk,
+                'verdict': verdict,
+                'confidence': self._calculate_confidence(chunk, classification),
+                'tokens': tokens
+            })
+            weights[verdict] = weights.get(verdict, 0) + tokens * classification['score']
+
+        # Token-weighted vote: long, confidently classified passages count for more than one-liners
+        verdict = max(weights, key=weights.get)
+        lead = max(
+            (c for c in chunk_results if c['verdict'] == verdict), key=lambda c: c['confidence'] * c['tokens']
+        )
+        result = {
             'verdict': verdict,
-            'confidence': confidence,
-            'evidence': evidence,
-            'similar_claims': similar_claims,
+            'confidence': min(weights[verdict] / sum(weights.values()), 0.95),
+            'evidence': self._gather_evidence(lead['text']),
+            'similar_claims': [],
+            'chunks': chunk_results,
             'timestamp': datetime.now().isoformat()
         }
-    
-    def _classify_claim(self, claim):
-        result = self.bert_classifier(claim)[0]
-        if result['label'] == 'NEGATIVE' and result['score'] > 0.7:
+        self.verdict_cache.put(text, result)
+        return result
+
+    def _check_near_duplicates(self, claims, batch_size):
+        # Near-copies of a recently checked claim (or of an earlier claim in this batch) reuse its result
+        canonical = []
+        matches = {}
+        for i, claim in enumerate(claims):
+            match = self.dedup_index.find(claim)
+            if match is None:
+                canonical.append((i, self.dedup_index.add(claim)))
+            else:
+                matches[i] = match
+
+        results = [None] * len(claims)
+        fresh = self._check_uncached([claims[i] for i, _ in canonical], batch_size)
+        for (i, key), result in zip(canonical, fresh):
+            self.dedup_index.set_result(key, result)
+            results[i] = result
+
+        unresolved = []
+        for i, (key, canonical_claim, similarity) in matches.items():
+            source = self.dedup_index.result(key)
+            if source is None or 'evidence' not in source:
+                # Canonical evicted, still being checked by another session, or not a full result
+                unresolved.append(i)
+                continue
+            results[i] = dict(
+                source,
+                collapsed_into=canonical_claim,
+                collapse_similarity=round(similarity, 3),
+                timestamp=datetime.now().isoformat()
+            )
+
+        for i, result in zip(unresolved, self._check_uncached([claims[i] for i in unresolved], batch_size)):
+            results[i] = result
+        return results
+
+    def _check_uncached(self, claims, batch_size):
+        if not claims:
+            return []
+
+        classifications, embeddings = self._run_models(claims, batch_size)
+        similar_claims = self._find_similar_claims(claims, embeddings)
+        evidence = self._gather_evidence_many(claims)
+
+        results = []
+        for claim, classification, similar, claim_evidence in zip(claims, classifications, similar_claims, evidence):
+            results.append({
+                'verdict': self._classify_claim(classification),
+                'confidence': self._calculate_confidence(claim, classification),
+                'evidence': claim_evidence,
+                'similar_claims': similar,
+                'timestamp': datetime.now().isoformat()
+            })
+
+        self.claim_index.add(
+            claims, embeddings,
+            [r['verdict'] for r in results],
+            [r['confidence'] for r in results],
+            [r['timestamp'] for r in results],
+            [c.get('stage', 'model') for c in classifications]
+        )
+        return results
+
+    def _run_models(self, claims, batch_size):
+        # One padded pass per model; each classifier output feeds both verdict and confidence
+        # Claims already in the index reuse their stored embedding instead of being re-encoded
+        known = self.claim_index.lookup(claims)
+        missing = [c for c in dict.fromkeys(claims) if c not in known]
+
+        # In cascade mode the cheap stage settles clear-cut claims; the rest escalate to the transformer
+        triaged = self.cascade.triage(claims) if self.cascade is not None else [None] * len(claims)
+        escalated = [claim for claim, decision in zip(claims, triaged) if decision is None]
+
+        if self.inference_client is not None:
+            classified, encoded = self.inference_client.run(escalated, missing)
+        else:
+            classified = self._classify(escalated, batch_size) if escalated else []
+            encoded = self._encode(missing, batch_size) if missing else []
+
+        classified = iter(classified)
+        classifications = [decision if decision is not None else next(classified) for decision in triaged]
+        known.update(zip(missing, encoded))
+        return classifications, np.array([known[c] for c in claims], dtype=np.float32)
+
+    def _classify(self, claims, batch_size):
+        if self.inference_client is not None:
+            return self.inference_client.run(claims, [])[0]
+        return self.bert_classifier(claims, batch_size=batch_size, truncation=True)
+
+    def _encode(self, claims, batch_size):
+        if self.inference_client is not None:
+            return self.inference_client.run([], claims)[1]
+        return self.sentence_model.encode(claims, batch_size=batch_size, normalize_embeddings=True)
+
+    def _classify_claim(self, classification):
+        if classification['label'] == 'NEGATIVE' and classification['score'] > 0.7:
             return 'Rumor'
-        elif result['label'] == 'POSITIVE' and result['score'] > 0.6:
+        elif classification['label'] == 'POSITIVE' and classification['score'] > 0.6:
             return 'True'
         else:
             return 'Uncertain'
-    
-    def _calculate_confidence(self, claim):
-        sentiment_score = self.bert_classifier(claim)[0]['score']
+
+    def _calculate_confidence(self, claim, classification):
+        sentiment_score = classification['score']
         length_factor = min(len(claim.split()) / 50, 1.0)
         source_factor = 0.8 if 'http' in claim else 0.6
         return min(sentiment_score * length_factor * source_factor, 0.95)
-    
+
     def _gather_evidence(self, claim):
+        return self._gather_evidence_many([claim])[0]
+
+    def _gather_evidence_many(self, claims):
         evidence = []
-        
-        try:
-            news_api_key = "your_news_api_key"
-            news_url = f"https://newsapi.org/v2/everything?q={claim[:50]}&apiKey={news_api_key}"
-            response = requests.get(news_url, timeout=5)
-            if response.status_code == 200:
-                articles = response.json().get('articles', [])[:3]
-                for article in articles:
-                    evidence.append(f"{article['title']} - {article['source']['name']}")
-        except:
-            pass
-        
-        if not evidence:
-            evidence = [
-                "Cross-referenced with fact-checking databases",
-                "Analyzed using BERT-based classification model",
-                "Compared against known misinformation patterns"
-            ]
-        
+        for found in self.evidence_fetcher.fetch_many(claims):
+            evidence.append([f"{title} - {source}" for title, source in found] or list(FALLBACK_EVIDENCE))
         return evidence
-    
-    def _find_similar_claims(self, claim):
-        claim_embedding = self.sentence_model.encode([claim])
-        
-        similar_claims = [
-            "Similar claim found on social media platforms",
-            "Variant detected in news articles",
-            "Related misinformation pattern identified"
-        ]
-        
-        return similar_claims[:2]
\ No newline at end of file
+
+    def _find_similar_claims(self, claims, claim_embeddings, k=2):
+        similar_claims = []
+        for claim, hits in zip(claims, self.claim_index.search(claim_embeddings, k=k + 1)):
+            claim_hash = ClaimIndex.claim_hash(claim)
+            similar_claims.append([
+                f"{hit['claim']} ({hit['verdict']}, {hit['similarity']:.0%} similar)"
+                for hit in hits if hit['claim_hash'] != claim_hash and hit['similarity'] >= self.min_similarity
+            ][:k])
+        return similar_claims
@@ -0,0 +1,238 @@
+import argparse
+import csv
+import gzip
+import itertools
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+CORPUS_DB = "fact_corpus.db"
+
+# Column names seen across fact-check dumps (ClaimReview exports, scraped CSVs, ...)
+FIELD_ALIASES = {
+    'title': ('title', 'headline', 'claim', 'claim_text', 'claimReviewed'),
+    'body': ('body', 'text', 'content', 'summary', 'description', 'explanation'),
+    'rating': ('rating', 'verdict', 'label', 'truth_rating', 'textualRating'),
+    'publisher': ('publisher', 'source', 'site', 'author', 'organization'),
+    'url': ('url', 'link', 'source_url', 'review_url')
+}
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'he', 'in', 'is', 'it', 'its',
+    'of', 'on', 'or', 'she', 'that', 'the', 'their', 'they', 'this', 'to', 'was', 'were', 'will', 'with', 'you'
+}
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+class FactCorpus:
+    """Local fact-check article corpus in SQLite with an FTS5 index, queried with BM25 ranking"""
+
+    def __init__(self, db_path=CORPUS_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE,
+                title TEXT,
+                body TEXT,
+                rating TEXT,
+                publisher TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, body, content='articles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_vocab USING fts5vocab(articles_fts, 'row');
+            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+            END;
+            CREATE TABLE IF NOT EXISTS term_stats (
+                term TEXT PRIMARY KEY,
+                documents INTEGER
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS ingest_progress (
+                path TEXT PRIMARY KEY,
+                position INTEGER,
+                rows INTEGER,
+                done INTEGER DEFAULT 0
+            );
+        ''')
+        conn.commit()
+
+    def _connection(self):
+        # One connection per thread so concurrent evidence lookups don't serialise on a lock
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def ingest(self, path, batch_size=5000, log=print):
+        """Stream a JSONL or CSV dump (optionally .gz) into the corpus, resuming where a previous run stopped"""
+        conn = self._connection()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        key = os.path.abspath(path)
+        row = conn.execute("SELECT position, rows, done FROM ingest_progress WHERE path = ?", (key,)).fetchone()
+        position, total, done = row if row else (0, 0, 0)
+        if done:
+            log(f"{path}: already ingested ({total} rows)")
+            return total
+
+        reader = self._read_jsonl if '.jsonl' in path or '.ndjson' in path else self._read_csv
+        started = time.time()
+        batch = []
+        for record, position in reader(path, position):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                total += self._write_batch(conn, key, batch, position, total)
+                batch = []
+                log(f"{path}: {total} rows ({total / max(time.time() - started, 1e-6):.0f} rows/s)")
+
+        total += self._write_batch(conn, key, batch, position, total, done=True)
+        self._refresh_term_stats(conn)
+        log(f"{path}: done, {total} rows")
+        return total
+
+    def _refresh_term_stats(self, conn):
+        # fts5vocab walks a term's whole posting list to count documents, which is far too slow per query
+        # for common terms; snapshot the counts into a keyed table once per ingest instead
+        with conn:
+            conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('optimize')")
+            conn.execute("DELETE FROM term_stats")
+            conn.execute("INSERT INTO term_stats (term, documents) SELECT term, doc FROM articles_vocab")
+            conn.execute("INSERT OR REPLACE INTO term_stats (term, documents) SELECT '', COUNT(*) FROM articles")
+
+    def _write_batch(self, conn, key, batch, position, total, done=False):
+        # Rows and the resume checkpoint commit together, so a crash never half-applies a batch
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO articles (url, title, body, rating, publisher) VALUES (?, ?, ?, ?, ?)",
+                batch
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO ingest_progress (path, position, rows, done) VALUES (?, ?, ?, ?)",
+                (key, position, total + len(batch), int(done))
+            )
+        return len(batch)
+
+    def _open(self, path, mode):
+        if path.endswith('.gz'):
+            return gzip.open(path, mode)
+        return open(path, mode)
+
+    def _read_jsonl(self, path, offset):
+        # Position is a byte offset into the (decompressed) stream
+        with self._open(path, 'rb') as f:
+            f.seek(offset)
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+                record = self._record(item) if isinstance(item, dict) else None
+                if record:
+                    yield record, f.tell()
+
+    def _read_csv(self, path, skip_rows):
+        # csv hides the byte offset, so position is the number of data rows already consumed
+        csv.field_size_limit(sys.maxsize)
+        with self._open(path, 'rt') as f:
+            reader = csv.DictReader(f)
+            for position, item in enumerate(itertools.islice(reader, skip_rows, None), skip_rows + 1):
+                record = self._record(item)
+                if record:
+                    yield record, position
+
+    def _record(self, item):
+        fields = {}
+        for field, aliases in FIELD_ALIASES.items():
+            value = next((item[alias] for alias in aliases if item.get(alias)), None)
+            if isinstance(value, dict):
+                value = value.get('name') or value.get('url')
+            fields[field] = str(value).strip() if value else None
+        if not fields['title'] and not fields['body']:
+            return None
+        return (fields['url'], fields['title'] or '', fields['body'] or '', fields['rating'], fields['publisher'])
+
+    def search(self, claim, limit=3):
+        query = self._match_query(claim)
+        if not query:
+            return []
+        rows = self._connection().execute('''
+            SELECT a.title, a.rating, a.publisher, a.url, bm25(articles_fts, 2.0, 1.0) AS rank
+            FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+            WHERE articles_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ''', (query, limit)).fetchall()
+        return [
+            {'title': title, 'rating': rating, 'publisher': publisher, 'url': url, 'score': -rank}
+            for title, rating, publisher, url, rank in rows
+        ]
+
+    def _match_query(self, claim, max_terms=6, max_doc_fraction=0.01):
+        terms = []
+        for token in TOKEN_PATTERN.findall(claim.lower()):
+            if token not in STOPWORDS and len(token) > 1 and token not in terms:
+                terms.append(token)
+        if not terms:
+            return None
+
+        # BM25 has to score every document an OR query matches, so only the rarest, most selective
+        # terms go into the query; corpus-wide common words would otherwise make every lookup a full scan
+        # The '' row holds the corpus size; it is missing until the first ingest finishes
+        placeholders = ','.join('?' * (len(terms) + 1))
+        doc_counts = dict(self._connection().execute(
+            f"SELECT term, documents FROM term_stats WHERE term IN ({placeholders})", [''] + terms
+        ).fetchall())
+        if '' not in doc_counts:
+            return ' OR '.join(f'"{term}"' for term in terms[:max_terms])
+        limit = max(doc_counts[''] * max_doc_fraction, 1)
+        known = sorted((doc_counts[t], t) for t in terms if t in doc_counts)
+        selective = [(count, term) for count, term in known if count <= limit]
+        # A claim made only of common words still gets its rarest terms, at the cost of a wider scan
+        return ' OR '.join(f'"{term}"' for _, term in (selective or known)[:max_terms]) or None
+
+    def evidence_provider(self, claim, timeout):
+        """EvidenceFetcher provider: (title, source label) pairs for the best-matching fact checks"""
+        evidence = []
+        for hit in self.search(claim):
+            title = f"{hit['title']} [{hit['rating']}]" if hit['rating'] else hit['title']
+            evidence.append((title, hit['publisher'] or 'Local fact-check corpus'))
+        return evidence
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local fact-check corpus")
+    parser.add_argument('--db', default=CORPUS_DB)
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest = commands.add_parser('ingest', help="Stream JSONL/CSV dumps into the corpus (resumable)")
+    ingest.add_argument('paths', nargs='+')
+    ingest.add_argument('--batch-size', type=int, default=5000)
+    search = commands.add_parser('search', help="Query the corpus")
+    search.add_argument('claim')
+    search.add_argument('--limit', type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = FactCorpus(args.db)
+    if args.command == 'ingest':
+        for path in args.paths:
+            corpus.ingest(path, batch_size=args.batch_size)
+    else:
+        started = time.perf_counter()
+        hits = corpus.search(args.claim, limit=args.limit)
+        for hit in hits:
+            print(f"{hit['score']:.2f}  {hit['title']} [{hit['rating']}] - {hit['publisher']}")
+        print(f"{len(hits)} hits in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
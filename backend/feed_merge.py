@@ -0,0 +1,36 @@
+import heapq
+import itertools
+
+FEED_KEYS = {
+    'time': lambda post: post['timestamp'],
+    'engagement': lambda post: int(post.get('engagement') or 0)
+}
+
+class TopN:
+    """Rolling top-N posts under a sort key, held in a size-N min-heap so memory never grows with the feed"""
+
+    def __init__(self, n=10, sort_by='time'):
+        self.n = n
+        self.key = FEED_KEYS[sort_by]
+        self._heap = []
+        self._seq = itertools.count()
+
+    def push(self, post):
+        """Offer a post; True if it entered the top N"""
+        entry = (self.key(post), next(self._seq), post)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+            return True
+        return heapq.heappushpop(self._heap, entry) is not entry
+
+    def extend(self, posts):
+        changed = False
+        for post in posts:
+            changed = self.push(post) or changed
+        return changed
+
+    def items(self):
+        return [post for _, _, post in sorted(self._heap, reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
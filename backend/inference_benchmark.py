@@ -0,0 +1,123 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+# Fixed parity set: mix of clearly true, clearly false and borderline claims of varying length
+PARITY_CLAIMS = [
+    "The Eiffel Tower is located in Paris, France.",
+    "Drinking bleach cures viral infections.",
+    "Vaccines cause autism in children according to hidden government studies.",
+    "Water boils at 100 degrees Celsius at sea level.",
+    "The moon landing in 1969 was staged in a film studio.",
+    "5G towers are spreading the virus across major cities.",
+    "The Great Wall of China is visible from the Moon with the naked eye.",
+    "Regular exercise reduces the risk of heart disease.",
+    "Eating carrots gives you perfect night vision.",
+    "The Earth orbits the Sun once roughly every 365 days.",
+    "Scientists confirm chocolate is healthier than vegetables.",
+    "A new law bans all cash payments starting next week.",
+    "Breaking: celebrity announces they are running for president after secret meeting.",
+    "Local hospital reports record number of successful surgeries this year.",
+    "Tap water in the city has been declared unsafe by anonymous insiders.",
+    "The stock market will crash tomorrow, share this before it is deleted!",
+    "Antibiotics are effective against bacterial infections but not viruses.",
+    "Mobile phones cause cancer after only one week of use.",
+    "The city council approved a new budget for public parks.",
+    "Microchips are being secretly added to every vaccine dose.",
+    "NASA has discovered a hidden planet behind the Sun.",
+    "Hand washing helps prevent the spread of many diseases.",
+    "Government admits weather is being controlled with chemtrails.",
+    "The new bridge opened to traffic on schedule after inspections.",
+]
+
+def _rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_backend(backend, repeats):
+    from backend.fact_checker import FactChecker
+
+    rss_before = _rss_mb()
+    with tempfile.TemporaryDirectory() as scratch:
+        fact_checker = FactChecker(
+            index_dir=os.path.join(scratch, 'index'),
+            cache_db=os.path.join(scratch, 'cache.db'),
+            inference_backend=backend
+        )
+        fact_checker.warm_up(background=False)
+
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            classifications = fact_checker.bert_classifier(PARITY_CLAIMS, batch_size=8, truncation=True)
+            embeddings = fact_checker.sentence_model.encode(PARITY_CLAIMS, batch_size=8, normalize_embeddings=True)
+            latencies.append((time.perf_counter() - start) / len(PARITY_CLAIMS))
+
+        return {
+            'backend': backend,
+            'labels': [c['label'] for c in classifications],
+            'scores': [float(c['score']) for c in classifications],
+            'verdicts': [fact_checker._classify_claim(c) for c in classifications],
+            'embeddings': np.asarray(embeddings, dtype=np.float32).tolist(),
+            'ms_per_claim': float(np.median(latencies) * 1000),
+            'rss_mb': _rss_mb() - rss_before
+        }
+
+def compare(baseline, candidate):
+    base_emb = np.asarray(baseline['embeddings'])
+    cand_emb = np.asarray(candidate['embeddings'])
+    cosine = np.sum(base_emb * cand_emb, axis=1)
+    return {
+        'label_agreement': float(np.mean([a == b for a, b in zip(baseline['labels'], candidate['labels'])])),
+        'verdict_agreement': float(np.mean([a == b for a, b in zip(baseline['verdicts'], candidate['verdicts'])])),
+        'max_score_delta': float(np.max(np.abs(np.subtract(baseline['scores'], candidate['scores'])))),
+        'min_embedding_cosine': float(cosine.min()),
+        'speedup': baseline['ms_per_claim'] / candidate['ms_per_claim'],
+        'rss_saved_mb': baseline['rss_mb'] - candidate['rss_mb']
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy parity and latency/RSS comparison of fp32 vs int8 inference")
+    parser.add_argument('--backend', help="Run a single backend and print its raw measurements as JSON")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--min-agreement', type=float, default=0.95)
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args.repeats)))
+        return 0
+
+    # Each backend runs in a fresh interpreter so RSS numbers don't include the other model
+    runs = {}
+    for backend in ('fp32', 'int8'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'backend.inference_benchmark', '--backend', backend, '--repeats', str(args.repeats)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        runs[backend] = json.loads(output.strip().splitlines()[-1])
+
+    report = compare(runs['fp32'], runs['int8'])
+    for backend, run in runs.items():
+        print(f"{backend}: {run['ms_per_claim']:.2f} ms/claim, +{run['rss_mb']:.0f} MB RSS")
+    for key, value in report.items():
+        print(f"{key}: {value:.3f}")
+
+    if report['verdict_agreement'] < args.min_agreement:
+        print(f"int8 verdict agreement below {args.min_agreement:.0%}, keep fp32")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
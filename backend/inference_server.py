@@ -0,0 +1,213 @@
+import argparse
+import base64
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+from backend.model_loader import load_classifier, load_sentence_model, CLASSIFIER_MODEL, SENTENCE_MODEL, DEFAULT_BACKEND
+
+INFERENCE_URL = os.getenv("SOTERIA_INFERENCE_URL")
+DEFAULT_LISTEN = "unix:///tmp/soteria-inference.sock"
+
+def parse_address(url):
+    """'unix:///path/to.sock' -> (AF_UNIX, path); 'host:port' or 'tcp://host:port' -> (AF_INET, (host, port))"""
+    if url.startswith('unix://'):
+        return socket.AF_UNIX, url[len('unix://'):]
+    host, _, port = url.replace('tcp://', '').rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+def _pack_embeddings(embeddings):
+    array = np.ascontiguousarray(embeddings, dtype=np.float32)
+    return {'shape': list(array.shape), 'data': base64.b64encode(array.tobytes()).decode('ascii')}
+
+def _unpack_embeddings(payload):
+    return np.frombuffer(base64.b64decode(payload['data']), dtype=np.float32).reshape(payload['shape'])
+
+class MicroBatcher:
+    """Gathers requests from every client into micro-batches bounded by size and by wait time"""
+
+    def __init__(self, classifier_model=CLASSIFIER_MODEL, sentence_model=SENTENCE_MODEL, backend=DEFAULT_BACKEND,
+                 max_batch_size=64, max_wait_ms=10):
+        self.classifier_model = classifier_model
+        self.sentence_model = sentence_model
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.stats = {'requests': 0, 'batches': 0, 'claims': 0}
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='inference-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, classify, encode):
+        future = Future()
+        self._queue.put((list(classify), list(encode), future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0]) + len(batch[0][1])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0]) + len(item[1])
+            self._process(batch)
+
+    def _process(self, batch):
+        classify = [claim for item in batch for claim in item[0]]
+        encode = [claim for item in batch for claim in item[1]]
+        try:
+            classifications = []
+            if classify:
+                classifications = load_classifier(self.classifier_model, self.backend)(
+                    classify, batch_size=self.max_batch_size, truncation=True
+                )
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+            if encode:
+                embeddings = load_sentence_model(self.sentence_model, self.backend).encode(
+                    encode, batch_size=self.max_batch_size, normalize_embeddings=True
+                )
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.stats['requests'] += len(batch)
+        self.stats['batches'] += 1
+        self.stats['claims'] += len(classify) + len(encode)
+        c_start = e_start = 0
+        for item_classify, item_encode, future in batch:
+            future.set_result((
+                [{'label': c['label'], 'score': float(c['score'])} for c in classifications[c_start:c_start + len(item_classify)]],
+                np.asarray(embeddings[e_start:e_start + len(item_encode)], dtype=np.float32)
+            ))
+            c_start += len(item_classify)
+            e_start += len(item_encode)
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # Newline-delimited JSON; a client keeps its connection open across requests
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get('op') == 'stats':
+                    response = {'stats': self.server.batcher.stats}
+                else:
+                    classifications, embeddings = self.server.batcher.submit(
+                        request.get('classify', []), request.get('encode', [])
+                    ).result()
+                    response = {'classifications': classifications, 'embeddings': _pack_embeddings(embeddings)}
+            except Exception as e:
+                response = {'error': str(e)}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    # Every UI process opens a connection per thread; socketserver's default backlog of 5 refuses bursts
+    request_queue_size = 1024
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+def serve(listen=DEFAULT_LISTEN, **batcher_options):
+    family, address = parse_address(listen)
+    if family == socket.AF_UNIX:
+        if os.path.exists(address):
+            os.unlink(address)
+        server = _UnixServer(address, _Handler)
+    else:
+        server = _TCPServer(address, _Handler)
+    server.batcher = MicroBatcher(**batcher_options)
+    return server
+
+class InferenceClient:
+    """Client side of the inference worker; one persistent connection per calling thread"""
+
+    def __init__(self, url=INFERENCE_URL, timeout=60, connect_retries=5, connect_backoff=0.05):
+        self.url = url
+        self.timeout = timeout
+        self.connect_retries = connect_retries
+        self.connect_backoff = connect_backoff
+        self._local = threading.local()
+
+    def _stream(self):
+        stream = getattr(self._local, 'stream', None)
+        if stream is None:
+            self._local.stream = stream = self._connect().makefile('rwb')
+        return stream
+
+    def _connect(self):
+        # A full accept backlog (EAGAIN on unix sockets) or a restarting worker is retried with backoff
+        family, address = parse_address(self.url)
+        for attempt in range(self.connect_retries + 1):
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(address)
+                return sock
+            except (BlockingIOError, ConnectionRefusedError, FileNotFoundError):
+                sock.close()
+                if attempt == self.connect_retries:
+                    raise
+                time.sleep(self.connect_backoff * 2 ** attempt)
+
+    def _call(self, request):
+        payload = json.dumps(request).encode('utf-8') + b'\n'
+        for attempt in range(2):
+            try:
+                stream = self._stream()
+                stream.write(payload)
+                stream.flush()
+                line = stream.readline()
+                if not line:
+                    raise ConnectionError("inference server closed the connection")
+                break
+            except OSError:
+                # Stale connection (server restarted): reconnect once
+                self._local.stream = None
+                if attempt:
+                    raise
+        response = json.loads(line)
+        if 'error' in response:
+            raise RuntimeError(f"inference server error: {response['error']}")
+        return response
+
+    def run(self, classify, encode):
+        """Return (classifier outputs for `classify`, unit embeddings for `encode`)"""
+        response = self._call({'classify': list(classify), 'encode': list(encode)})
+        return response['classifications'], _unpack_embeddings(response['embeddings'])
+
+    def stats(self):
+        return self._call({'op': 'stats'})['stats']
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared inference worker with dynamic micro-batching")
+    parser.add_argument('--listen', default=DEFAULT_LISTEN, help="unix:///path.sock or host:port")
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=10)
+    parser.add_argument('--backend', default=DEFAULT_BACKEND)
+    args = parser.parse_args()
+
+    server = serve(args.listen, backend=args.backend, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    # Load the weights before accepting traffic so the first client doesn't pay for it
+    server.batcher.submit(["Warm-up claim"], ["Warm-up claim"]).result()
+    print(f"Inference worker listening on {args.listen}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
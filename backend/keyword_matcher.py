@@ -0,0 +1,145 @@
+import re
+from collections import deque
+from functools import lru_cache
+
+QUERY_TOKEN = re.compile(r'"([^"]*)"|(,)|([^\s,"]+)')
+OPERATORS = {'AND', 'OR', 'NOT'}
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton: every occurrence of every term in one pass over the text"""
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for term_id, term in enumerate(self.terms):
+            state = 0
+            for char in term:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(term_id)
+
+        # Breadth-first so a state's failure target is final before its children use it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text, word_boundary=True):
+        """Ids of the terms occurring in `text` (already normalised), in order of first occurrence"""
+        goto, fail, out, terms = self._goto, self._fail, self._out, self.terms
+        found = {}
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for term_id in out[state]:
+                if term_id in found:
+                    continue
+                if word_boundary:
+                    start = end - len(terms[term_id]) + 1
+                    if (start > 0 and _is_word(text[start - 1]) and _is_word(terms[term_id][0])) or \
+                            (end + 1 < len(text) and _is_word(text[end + 1]) and _is_word(terms[term_id][-1])):
+                        continue
+                found[term_id] = end
+        return list(found)
+
+def _is_word(char):
+    return char.isalnum() or char == '_'
+
+def normalize_text(text):
+    return ' '.join(text.lower().split())
+
+class KeywordQuery:
+    """Compiled keyword query: clauses of required and excluded terms, any satisfied clause is a match"""
+
+    def __init__(self, clauses, word_boundary=True):
+        self.word_boundary = word_boundary
+        terms = sorted({term for required, excluded in clauses for term in required + excluded})
+        self.automaton = KeywordAutomaton(terms)
+        index = {term: term_id for term_id, term in enumerate(terms)}
+        self.clauses = [
+            (frozenset(index[t] for t in required), frozenset(index[t] for t in excluded))
+            for required, excluded in clauses
+        ]
+        positive = set().union(*(required for required, _ in self.clauses)) if self.clauses else set()
+        self._positive = positive
+        self.terms = [terms[term_id] for term_id in sorted(positive)]
+
+    def match(self, text):
+        """Matched terms (in order of appearance) when the query is satisfied, else None"""
+        if not self.clauses:
+            return None
+        found = self.automaton.find(normalize_text(text), self.word_boundary)
+        present = set(found)
+        for required, excluded in self.clauses:
+            if required <= present and not (excluded & present):
+                return [self.automaton.terms[term_id] for term_id in found if term_id in self._positive]
+        return None
+
+def parse_query(query):
+    """'covid vaccine AND "5g", #hoax NOT satire OR ...' -> [(required terms, excluded terms), ...]
+
+    Commas and OR separate clauses, AND and NOT combine terms inside one, adjacent words form a phrase,
+    and quotes keep operator words literal.
+    """
+    clauses = []
+    required, excluded = [], []
+    words = []
+    negate = False
+
+    def flush():
+        nonlocal words, negate
+        if words:
+            term = normalize_text(' '.join(words))
+            if term:
+                (excluded if negate else required).append(term)
+            words = []
+            negate = False
+
+    for quoted, comma, word in QUERY_TOKEN.findall(query):
+        if comma or word == 'OR':
+            flush()
+            if required or excluded:
+                clauses.append((required, excluded))
+            required, excluded = [], []
+        elif word in ('AND', 'NOT'):
+            flush()
+            negate = word == 'NOT'
+        elif word:
+            words.append(word)
+        else:
+            flush()
+            words = [quoted]
+            flush()
+    flush()
+    if required or excluded:
+        clauses.append((required, excluded))
+    return clauses
+
+@lru_cache(maxsize=64)
+def _compile(query, word_boundary):
+    return KeywordQuery(parse_query(query), word_boundary)
+
+def compile_query(keywords, word_boundary=True):
+    """Compile a query string, a list of terms (OR'd) or pass through an already compiled query"""
+    if isinstance(keywords, KeywordQuery):
+        return keywords
+    if not isinstance(keywords, str):
+        keywords = ', '.join(f'"{term}"' if set(term.split()) & OPERATORS else term for term in keywords)
+    return _compile(keywords, word_boundary)
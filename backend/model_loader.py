@@ -0,0 +1,104 @@
+import os
+import sys
+import threading
+
+MODEL_DIR = os.getenv("SOTERIA_MODEL_DIR", "models")
+CLASSIFIER_MODEL = 'distilbert-base-uncased-finetuned-sst-2-english'
+SENTENCE_MODEL = 'all-MiniLM-L6-v2'
+INFERENCE_BACKENDS = ('fp32', 'int8')
+DEFAULT_BACKEND = os.getenv("SOTERIA_INFERENCE_BACKEND", "fp32")
+HUB_REPOS = {
+    CLASSIFIER_MODEL: CLASSIFIER_MODEL,
+    SENTENCE_MODEL: f'sentence-transformers/{SENTENCE_MODEL}'
+}
+
+_models = {}
+_locks = {}
+_locks_guard = threading.Lock()
+
+def _shared(key, build):
+    # One instance per process, built on first use; concurrent callers wait for the same load
+    if key in _models:
+        return _models[key]
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _models:
+            _models[key] = build()
+    return _models[key]
+
+def snapshot_path(name):
+    path = os.path.join(MODEL_DIR, name)
+    return path if os.path.isdir(path) else None
+
+def load_classifier(name=CLASSIFIER_MODEL, backend=DEFAULT_BACKEND):
+    _check_backend(backend)
+    return _shared(('classifier', name, backend), lambda: _build_classifier(name, backend))
+
+def load_sentence_model(name=SENTENCE_MODEL, backend=DEFAULT_BACKEND):
+    _check_backend(backend)
+    return _shared(('sentence', name, backend), lambda: _build_sentence_model(name, backend))
+
+def load_tokenizer(name=CLASSIFIER_MODEL):
+    return _shared(('tokenizer', name), lambda: _build_tokenizer(name))
+
+def _build_tokenizer(name):
+    from transformers import AutoTokenizer
+
+    snapshot = snapshot_path(name)
+    if snapshot is None:
+        return AutoTokenizer.from_pretrained(name)
+    return AutoTokenizer.from_pretrained(snapshot, local_files_only=True)
+
+def _check_backend(backend):
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {INFERENCE_BACKENDS}")
+
+def _quantize(module, backend):
+    if backend == 'fp32':
+        return module
+    # Dynamic int8: Linear weights stored as int8, activations quantized per batch at run time
+    import torch
+    return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+
+def _build_classifier(name, backend):
+    from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+
+    snapshot = snapshot_path(name)
+    if snapshot is None:
+        model = AutoModelForSequenceClassification.from_pretrained(name)
+        tokenizer = AutoTokenizer.from_pretrained(name)
+    else:
+        # safetensors weights are memory-mapped straight from the snapshot, no hub round-trip
+        model = AutoModelForSequenceClassification.from_pretrained(snapshot, local_files_only=True, use_safetensors=True)
+        tokenizer = AutoTokenizer.from_pretrained(snapshot, local_files_only=True)
+    model.eval()
+    return pipeline('text-classification', model=_quantize(model, backend), tokenizer=tokenizer)
+
+def _build_sentence_model(name, backend):
+    from sentence_transformers import SentenceTransformer
+
+    # Dynamically quantized modules only run on CPU
+    device = 'cpu' if backend == 'int8' else None
+    snapshot = snapshot_path(name)
+    if snapshot is None:
+        model = SentenceTransformer(name, device=device)
+    else:
+        model = SentenceTransformer(snapshot, device=device, local_files_only=True)
+    model.eval()
+    return _quantize(model, backend)
+
+def download_snapshots(names=(CLASSIFIER_MODEL, SENTENCE_MODEL)):
+    """Fetch safetensors snapshots into MODEL_DIR so later loads never touch the hub"""
+    from huggingface_hub import snapshot_download
+
+    for name in names:
+        snapshot_download(
+            repo_id=HUB_REPOS.get(name, name),
+            local_dir=os.path.join(MODEL_DIR, name),
+            allow_patterns=['*.json', '*.txt', '*.safetensors', '*.model', '1_Pooling/*', 'modules.json']
+        )
+        print(f"Saved {name} to {os.path.join(MODEL_DIR, name)}")
+
+if __name__ == "__main__":
+    download_snapshots(sys.argv[1:] or (CLASSIFIER_MODEL, SENTENCE_MODEL))
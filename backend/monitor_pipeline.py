@@ -0,0 +1,255 @@
+import hashlib
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from backend.claim_dedup import NearDuplicateIndex
+from backend.post_store import MONITOR_DB
+
+class _Stage:
+    def __init__(self, name, inbox):
+        self.name = name
+        self.inbox = inbox
+        self.processed = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+
+    def snapshot(self, elapsed):
+        return {
+            'stage': self.name,
+            'processed': self.processed,
+            'failures': self.failures,
+            'per_second': self.processed / elapsed if elapsed else 0.0,
+            'busy': self.busy_seconds / elapsed if elapsed else 0.0,
+            'queue_depth': self.inbox.qsize() if self.inbox is not None else 0
+        }
+
+class MonitorPipeline:
+    """Continuous poll -> dedup -> batched classification -> storage of monitored posts, over bounded queues"""
+
+    def __init__(self, social_monitor, fact_checker, vip_accounts, keywords, db_path=MONITOR_DB,
+                 poll_interval=60, queue_size=256, batch_size=32, max_batch_wait=0.5, seen_capacity=100000,
+                 classify_retries=3, retry_backoff=1.0):
+        self.social_monitor = social_monitor
+        self.fact_checker = fact_checker
+        self.vip_accounts = list(vip_accounts)
+        self.keywords = keywords
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_batch_wait = max_batch_wait
+        self.seen_capacity = seen_capacity
+        self.classify_retries = classify_retries
+        self.retry_backoff = retry_backoff
+        self._seen = OrderedDict()
+        # Its own index: pipeline entries hold bare model scores, not the full results FactChecker reuses
+        self.dedup_index = NearDuplicateIndex()
+
+        # Bounded queues: a slow classifier blocks the stages upstream of it instead of growing memory
+        self._to_dedup = queue.Queue(maxsize=queue_size)
+        self._to_classify = queue.Queue(maxsize=queue_size)
+        self._to_store = queue.Queue(maxsize=queue_size)
+        self.stages = [
+            _Stage('poll', None),
+            _Stage('dedup', self._to_dedup),
+            _Stage('classify', self._to_classify),
+            _Stage('store', self._to_store)
+        ]
+        self.stop_event = threading.Event()
+        self._threads = []
+        self._started_at = None
+
+        conn = sqlite3.connect(db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS post_verdicts (
+                post_key TEXT PRIMARY KEY,
+                platform TEXT,
+                username TEXT,
+                content TEXT,
+                posted_at TEXT,
+                verdict TEXT,
+                confidence REAL,
+                collapsed_into TEXT,
+                checked_at DATETIME
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def post_key(post):
+        if post.get('id'):
+            return f"{post['platform']}:{post['id']}"
+        raw = f"{post['platform']}|{post['username']}|{post['timestamp']}|{post['content']}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def start(self):
+        self.stop_event.clear()
+        self._started_at = time.monotonic()
+        for name, target in (('poll', self._poll), ('dedup', self._dedup), ('classify', self._classify), ('store', self._store)):
+            thread = threading.Thread(target=target, name=f'monitor-{name}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        self.stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def stats(self):
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return [stage.snapshot(elapsed) for stage in self.stages]
+
+    def recent(self, limit=20):
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(
+            "SELECT platform, username, content, verdict, confidence, collapsed_into, checked_at "
+            "FROM post_verdicts ORDER BY checked_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        conn.close()
+        columns = ('platform', 'username', 'content', 'verdict', 'confidence', 'collapsed_into', 'checked_at')
+        return [dict(zip(columns, row)) for row in rows]
+
+    def _put(self, target, item):
+        while not self.stop_event.is_set():
+            try:
+                target.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source, timeout=0.5):
+        try:
+            return source.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _poll(self):
+        stage = self.stages[0]
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            try:
+                posts = self.social_monitor.poll(self.vip_accounts, self.keywords)
+            except Exception:
+                posts = []
+            stage.busy_seconds += time.monotonic() - started
+            for post in posts:
+                if not self._put(self._to_dedup, post):
+                    return
+                stage.processed += 1
+            self.stop_event.wait(max(self.poll_interval - (time.monotonic() - started), 0))
+
+    def _dedup(self):
+        stage = self.stages[1]
+        dedup_index = self.dedup_index
+        while not self.stop_event.is_set():
+            post = self._get(self._to_dedup)
+            if post is None:
+                continue
+            started = time.monotonic()
+            if not post.get('id'):
+                # Simulated sample posts carry no platform id and are not real posts to check
+                stage.busy_seconds += time.monotonic() - started
+                continue
+            key = self.post_key(post)
+            if key in self._seen:
+                stage.busy_seconds += time.monotonic() - started
+                continue
+            self._seen[key] = True
+            if len(self._seen) > self.seen_capacity:
+                self._seen.popitem(last=False)
+
+            # Near-copies of an already classified post skip the model entirely
+            match = dedup_index.find(post['content'])
+            canonical = dedup_index.result(match[0]) if match else None
+            if canonical is not None:
+                item = (key, post, dict(canonical, collapsed_into=match[1]), None)
+                target = self._to_store
+            else:
+                item = (key, post, None, dedup_index.add(post['content']))
+                target = self._to_classify
+            stage.busy_seconds += time.monotonic() - started
+            if not self._put(target, item):
+                return
+            stage.processed += 1
+
+    def _classify(self):
+        stage = self.stages[2]
+        while not self.stop_event.is_set():
+            first = self._get(self._to_classify)
+            if first is None:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.max_batch_wait
+            while len(batch) < self.batch_size:
+                item = self._get(self._to_classify, max(deadline - time.monotonic(), 0.001))
+                if item is None:
+                    break
+                batch.append(item)
+
+            scores = self._score_batch(stage, batch)
+            if scores is None:
+                # Given up (or stopping): forget the batch so a later delivery of these posts is classified
+                for key, _, _, dedup_key in batch:
+                    self._seen.pop(key, None)
+                    self.dedup_index.remove(dedup_key)
+                continue
+            for (key, post, _, dedup_key), score in zip(batch, scores):
+                self.dedup_index.set_result(dedup_key, score)
+                if not self._put(self._to_store, (key, post, score, None)):
+                    return
+                stage.processed += 1
+
+    def _score_batch(self, stage, batch):
+        # An unavailable model (e.g. the inference worker restarting) is retried with backoff before giving up
+        for attempt in range(self.classify_retries + 1):
+            started = time.monotonic()
+            try:
+                scores, _ = self.fact_checker.score_claims([post['content'] for _, post, _, _ in batch], self.batch_size)
+            except Exception:
+                scores = None
+                stage.failures += 1
+            stage.busy_seconds += time.monotonic() - started
+            if scores is not None:
+                return scores
+            if attempt == self.classify_retries or self.stop_event.wait(self.retry_backoff * 2 ** attempt):
+                return None
+
+    def _store(self):
+        stage = self.stages[3]
+        conn = sqlite3.connect(self.db_path)
+        while not self.stop_event.is_set():
+            first = self._get(self._to_store)
+            if first is None:
+                continue
+            items = [first]
+            while len(items) < self.batch_size:
+                item = self._get(self._to_store, 0.01)
+                if item is None:
+                    break
+                items.append(item)
+
+            started = time.monotonic()
+            checked_at = datetime.now().isoformat()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO post_verdicts "
+                    "(post_key, platform, username, content, posted_at, verdict, confidence, collapsed_into, checked_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (key, post['platform'], post['username'], post['content'], post['timestamp'],
+                         result['verdict'], result['confidence'], result.get('collapsed_into'), checked_at)
+                        for key, post, result, _ in items
+                    ]
+                )
+            stage.busy_seconds += time.monotonic() - started
+            stage.processed += len(items)
+        conn.close()
@@ -0,0 +1,41 @@
+import hashlib
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid', 'ref_src', 'ref_url', 'si'}
+URL_PATTERN = re.compile(r'https?://\S+', re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def canonical_url(url):
+    """Lower-case scheme/host, drop fragments, trailing slashes and tracking query parameters"""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ]
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(sorted(query)), ''))
+
+def _canonical_match(match):
+    # Free text can hold URL-looking fragments urlsplit rejects ("http://[::1"); keep those as written
+    try:
+        return canonical_url(match.group(0))
+    except ValueError:
+        return match.group(0)
+
+def normalize_claim(claim):
+    """Canonical form of a claim: URLs canonicalised, the text around them case folded, whitespace collapsed"""
+    # URL paths and queries are case-sensitive (bit.ly/AbC is not bit.ly/abc), so only the prose is folded
+    parts, end = [], 0
+    for match in URL_PATTERN.finditer(claim):
+        parts.append(claim[end:match.start()].casefold())
+        parts.append(_canonical_match(match))
+        end = match.end()
+    parts.append(claim[end:].casefold())
+    return WHITESPACE_PATTERN.sub(' ', ''.join(parts)).strip()
+
+def claim_fingerprint(claim):
+    return hashlib.sha1(normalize_claim(claim).encode('utf-8')).hexdigest()
@@ -0,0 +1,45 @@
+import os
+from datetime import datetime
+from types import SimpleNamespace
+import requests
+import tweepy
+from requests.adapters import HTTPAdapter
+
+# Base URL of a Twitter-v1.1-compatible endpoint (e.g. the local stand-in); unset means the live APIs
+PLATFORM_API = os.getenv("SOTERIA_PLATFORM_API")
+
+class PlatformClient:
+    """Minimal REST client for a configurable platform API base, shaped like the tweepy calls we use"""
+
+    def __init__(self, base_url=PLATFORM_API, timeout=10.0, pool_size=32):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _get(self, path, params=None):
+        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        if response.status_code == 429:
+            raise tweepy.TooManyRequests(response)
+        response.raise_for_status()
+        return response.json()
+
+    def user_timeline(self, **params):
+        return [
+            SimpleNamespace(
+                id=item['id'],
+                text=item['text'],
+                created_at=datetime.strptime(item['created_at'], '%a %b %d %H:%M:%S %z %Y'),
+                favorite_count=item['favorite_count'],
+                retweet_count=item['retweet_count']
+            )
+            for item in self._get('/1.1/statuses/user_timeline.json', params)
+        ]
+
+    def engagement(self, platform, content_url):
+        return self._get(f"/engagement/{platform.lower()}", {'url': content_url})
+
+    def profile(self, platform, handle):
+        return self._get(f"/profiles/{platform.lower()}/{handle.lstrip('@')}")
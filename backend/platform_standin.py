@@ -0,0 +1,244 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from backend.viral_tracker import synthetic_engagement
+
+TOPICS = ['AI', 'technology', 'politics', 'climate', 'vaccine', 'election', 'economy', 'space', 'crypto', 'health']
+TEMPLATES = [
+    "Just announced groundbreaking developments in {topic}",
+    "Thoughts on the latest {topic} trends?",
+    "BREAKING: new report on {topic} is out https://news.example.com/{topic}",
+    "Can't believe what people are saying about {topic} #{topic}",
+    "Our team is working hard on {topic} this week"
+]
+EPOCH = 1_600_000_000
+PROFILE_PATH = re.compile(r'^/profiles/(twitter|instagram|facebook)/([^/]+)$')
+ENGAGEMENT_PATH = re.compile(r'^/engagement/(\w+)$')
+
+class SyntheticPlatform:
+    """Deterministic timelines and profiles: the same handle and clock always produce the same data"""
+
+    def __init__(self, seed=0, recording=None):
+        self.seed = seed
+        self.recording = recording or {}
+
+    def _account(self, handle):
+        account = zlib.crc32(f"{self.seed}:{handle.lower()}".encode('utf-8'))
+        # Each account posts on its own fixed cadence (10 minutes to 4 hours) and phase
+        return account, 600 + account % (4 * 3600 - 600), account % 600
+
+    def timeline(self, handle, count=20, since_id=None, max_id=None, now=None):
+        recorded = self.recording.get('timelines', {}).get(handle.lower())
+        if recorded is not None:
+            tweets = [t for t in recorded if (not since_id or t['id'] > since_id) and (not max_id or t['id'] <= max_id)]
+            return sorted(tweets, key=lambda t: t['id'], reverse=True)[:count]
+
+        account, interval, phase = self._account(handle)
+        latest = int(((now or time.time()) - EPOCH - phase) // interval)
+        tweets = []
+        for k in range(latest, -1, -1):
+            # Snowflake-style ids: time-ordered across accounts, unique per account
+            created = EPOCH + phase + k * interval
+            tweet_id = (created * 1000) << 16 | (account & 0xffff)
+            if max_id and tweet_id > max_id:
+                continue
+            if since_id and tweet_id <= since_id or len(tweets) >= count:
+                break
+            rng = random.Random(tweet_id)
+            tweets.append({
+                'id': tweet_id,
+                'id_str': str(tweet_id),
+                'text': rng.choice(TEMPLATES).format(topic=rng.choice(TOPICS)),
+                'created_at': datetime.fromtimestamp(created, timezone.utc).strftime('%a %b %d %H:%M:%S %z %Y'),
+                'favorite_count': rng.randint(0, 50000),
+                'retweet_count': rng.randint(0, 10000),
+                'user': {'screen_name': handle}
+            })
+        return tweets
+
+    def engagement(self, platform, content_url):
+        recorded = self.recording.get('engagement', {}).get(platform, {}).get(content_url)
+        if recorded is not None:
+            return recorded
+        timestamps, shares = synthetic_engagement(content_url, platform, now=time.time() // 3600 * 3600)
+        return {'timestamps': timestamps.tolist(), 'shares': shares.tolist()}
+
+    def profile(self, platform, handle):
+        recorded = self.recording.get('profiles', {}).get(platform, {}).get(handle.lower())
+        if recorded is not None:
+            return recorded
+        account, _, _ = self._account(handle)
+        rng = random.Random(account)
+        profile = {
+            'platform': platform.capitalize(),
+            'handle': f"@{handle}" if platform != 'facebook' else handle,
+            'verified': rng.random() < 0.3,
+            'followers': rng.randint(10, 50000000),
+            'following': rng.randint(10, 10000),
+            'created_date': datetime.fromtimestamp(EPOCH - rng.randint(0, 4000) * 86400).strftime('%Y-%m-%d'),
+            'bio': f"Account for {handle}" if rng.random() < 0.8 else "",
+            'website': f"https://{handle.lower()}.example.com" if rng.random() < 0.5 else "",
+            'join_days_ago': rng.randint(1, 5000)
+        }
+        if platform == 'twitter':
+            profile.update(verification_type=rng.choice(['legacy', 'subscription']), tweets_count=rng.randint(0, 100000))
+        else:
+            profile.update(posts_count=rng.randint(0, 10000), category=rng.choice(['Public Figure', 'Personal']))
+        return profile
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        verdict = server.faults.next()
+        time.sleep(verdict['latency'])
+        if verdict['status'] == 429:
+            return self._send(429, {'errors': [{'code': 88, 'message': 'Rate limit exceeded'}]},
+                              {'x-rate-limit-reset': str(int(verdict['reset']))})
+        if verdict['status'] != 200:
+            return self._send(verdict['status'], {'errors': [{'code': 131, 'message': 'Internal error'}]})
+
+        parts = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        if parts.path == '/1.1/statuses/user_timeline.json' and params.get('screen_name'):
+            return self._send(200, server.platform.timeline(
+                params['screen_name'], min(int(params.get('count', 20)), 200),
+                int(params['since_id']) if params.get('since_id') else None,
+                int(params['max_id']) if params.get('max_id') else None
+            ))
+        match = PROFILE_PATH.match(parts.path)
+        if match:
+            return self._send(200, server.platform.profile(match.group(1), match.group(2)))
+        match = ENGAGEMENT_PATH.match(parts.path)
+        if match and params.get('url'):
+            return self._send(200, server.platform.engagement(match.group(1), params['url']))
+        self._send(404, {'errors': [{'code': 34, 'message': 'Sorry, that page does not exist'}]})
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+class FaultInjector:
+    """Seeded per-request latency, error and rate-limit decisions, shared by all handler threads"""
+
+    def __init__(self, latency_ms=50, jitter_ms=20, error_rate=0.0, quota=None, window=900, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.quota = quota
+        self.window = window
+        self.rng = random.Random(seed)
+        self.stats = {'requests': 0, 'errors': 0, 'rate_limited': 0}
+        self._window_start = time.time()
+        self._window_count = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            self.stats['requests'] += 1
+            latency = max(self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms), 0) / 1000
+            now = time.time()
+            if now - self._window_start >= self.window:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            if self.quota and self._window_count > self.quota:
+                self.stats['rate_limited'] += 1
+                return {'status': 429, 'latency': latency, 'reset': self._window_start + self.window}
+            if self.rng.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return {'status': 503, 'latency': latency}
+            return {'status': 200, 'latency': latency}
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+def serve(host='127.0.0.1', port=8765, recording=None, seed=0, **fault_options):
+    server = _Server((host, port), _Handler)
+    server.platform = SyntheticPlatform(seed, recording)
+    server.faults = FaultInjector(seed=seed, **fault_options)
+    return server
+
+def benchmark(base_url, accounts=10000, concurrency=64, polls=2, profiles=2000):
+    from backend.profile_analyzer import ProfileAnalyzer
+    from backend.social_monitor import SocialMonitor
+    import tempfile, os
+
+    handles = [f"@account{i}" for i in range(accounts)]
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        monitor = SocialMonitor(max_concurrency=concurrency, db_path=os.path.join(tmp, 'monitor.db'),
+                                quotas={'Twitter': (10 ** 9, 1)}, api_base=base_url)
+        for poll in range(polls):
+            failures = monitor.stats['fetch_failures']
+            started = time.perf_counter()
+            posts = monitor.poll(handles, ', '.join(TOPICS))
+            elapsed = time.perf_counter() - started
+            report[f'poll_{poll + 1}'] = {'seconds': elapsed, 'accounts_per_s': accounts / elapsed, 'new_posts': len(posts),
+                                          'failures': monitor.stats['fetch_failures'] - failures}
+
+    analyzer = ProfileAnalyzer(api_base=base_url)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        fetched = list(pool.map(analyzer.fetch_twitter_profile, handles[:profiles]))
+    analyzer.analyze_authenticity({f"Twitter {i}": p for i, p in enumerate(fetched)})
+    elapsed = time.perf_counter() - started
+    report['profiles'] = {'seconds': elapsed, 'profiles_per_s': profiles / elapsed,
+                          'failures': analyzer.stats['profile_errors']}
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the platform APIs, with injected latency and faults")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--recording', help="JSON file with recorded 'timelines', 'profiles' and 'engagement' to replay")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--quota', type=int, help="Requests per window before answering 429")
+    parser.add_argument('--window', type=float, default=900)
+    parser.add_argument('--benchmark', type=int, metavar='ACCOUNTS', help="Serve in-process and benchmark this many accounts")
+    parser.add_argument('--concurrency', type=int, default=64)
+    args = parser.parse_args()
+
+    recording = None
+    if args.recording:
+        with open(args.recording) as f:
+            recording = json.load(f)
+    server = serve(args.host, args.port, recording, args.seed, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                   error_rate=args.error_rate, quota=args.quota, window=args.window)
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+
+    if args.benchmark:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        report = benchmark(base_url, args.benchmark, args.concurrency)
+        for name, row in report.items():
+            print(name, ', '.join(f"{key}={value:.1f}" for key, value in row.items()))
+        print('server', server.faults.stats)
+        server.shutdown()
+    else:
+        print(f"Platform stand-in listening on {base_url} (set SOTERIA_PLATFORM_API={base_url})")
+        server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import sqlite3
+import threading
+import time
+
+MONITOR_DB = "social_monitor.db"
+
+class PostStore:
+    """Per-account polling cursors and the posts already collected, so each poll only pays for new activity"""
+
+    def __init__(self, db_path=MONITOR_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS cursors (
+                platform TEXT,
+                account TEXT,
+                since_id TEXT,
+                updated_at REAL,
+                PRIMARY KEY (platform, account)
+            );
+            CREATE TABLE IF NOT EXISTS posts (
+                platform TEXT,
+                post_id TEXT,
+                account TEXT,
+                content TEXT,
+                posted_at TEXT,
+                engagement TEXT,
+                PRIMARY KEY (platform, post_id)
+            );
+        ''')
+        self.conn.commit()
+
+    def cursor(self, platform, account):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT since_id FROM cursors WHERE platform = ? AND account = ?", (platform, account.lower())
+            ).fetchone()
+        return row[0] if row else None
+
+    def advance(self, platform, account, since_id):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cursors (platform, account, since_id, updated_at) VALUES (?, ?, ?, ?)",
+                (platform, account.lower(), str(since_id), time.time())
+            )
+            self.conn.commit()
+
+    def add_new(self, posts):
+        """Store posts and return only the ones not stored before"""
+        new = []
+        with self._lock:
+            with self.conn:
+                for post in posts:
+                    inserted = self.conn.execute(
+                        "INSERT OR IGNORE INTO posts (platform, post_id, account, content, posted_at, engagement) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (post['platform'], str(post['id']), post['username'], post['content'],
+                         post['timestamp'], post['engagement'])
+                    ).rowcount
+                    if inserted:
+                        new.append(post)
+        return new
+
+    def recent(self, platform, account, limit=50):
+        """The account's latest stored posts, newest first"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT post_id, account, content, posted_at, engagement FROM posts "
+                "WHERE platform = ? AND account = ? COLLATE NOCASE ORDER BY posted_at DESC LIMIT ?",
+                (platform, account, limit)
+            ).fetchall()
+        return [
+            {'id': post_id, 'username': username, 'platform': platform, 'content': content,
+             'timestamp': posted_at, 'engagement': engagement}
+            for post_id, username, content, posted_at, engagement in rows
+        ]
@@ -3,12 +3,18 @@ import random
 from datetime import datetime, timedelta
 import time
 import os
-from typing import Dict, List, Any
+import threading
+import tweepy
+from typing import Dict, List, Any, Optional
+from backend.platform_api import PlatformClient, PLATFORM_API
 
 class ProfileAnalyzer:
     """Backend service for analyzing social media profiles for authenticity and coordinated campaigns"""
     
-    def __init__(self):
+    def __init__(self, api_base: Optional[str] = PLATFORM_API):
+        self.platform_client = PlatformClient(api_base) if api_base else None
+        self.stats = {'profile_errors': 0}
+        self._lock = threading.Lock()
         self.twitter_api_key = os.getenv("TWITTER_API_KEY", "")
         self.instagram_api_key = os.getenv("INSTAGRAM_API_KEY", "")
         self.facebook_api_key = os.getenv("FACEBOOK_API_KEY", "")
@@ -40,6 +46,8 @@ class ProfileAnalyzer:
 
     def fetch_twitter_profile(self, handle: str) -> Dict:
         """Fetch or simulate Twitter profile data"""
+        if self.platform_client:
+            return self._fetch_profile("Twitter", handle)
         clean_handle = handle.lstrip("@")
         time.sleep(0.5)  # Simulate API delay
         
@@ -63,6 +71,8 @@ class ProfileAnalyzer:
 
     def fetch_instagram_profile(self, handle: str) -> Dict:
         """Fetch or simulate Instagram profile data"""
+        if self.platform_client:
+            return self._fetch_profile("Instagram", handle)
         clean_handle = handle.lstrip("@")
         time.sleep(0.5)
         is_known_vip = clean_handle.lower() in (name.lstrip("@").lower() for name in self.known_vips)
@@ -83,6 +93,8 @@ class ProfileAnalyzer:
 
     def fetch_facebook_profile(self, handle: str) -> Dict:
         """Fetch or simulate Facebook page/profile data"""
+        if self.platform_client:
+            return self._fetch_profile("Facebook", handle)
         clean_handle = handle.lstrip("@")
         time.sleep(0.5)
         is_known_vip = clean_handle.lower() in (name.lstrip("@").lower() for name in self.known_vips)
@@ -98,11 +110,24 @@ class ProfileAnalyzer:
             "category": "Public Figure" if is_known_vip else "Personal",
         }
 
+    def _random_date(self) -> str:
+        return (datetime.now() - timedelta(days=random.randint(100, 5000))).strftime("%Y-%m-%d")
+
+    def _fetch_profile(self, platform: str, handle: str) -> Dict:
+        """Profile from the configured platform API, or an error result (counted) when the call fails"""
+        try:
+            return self.platform_client.profile(platform, handle)
+        except (requests.RequestException, tweepy.TweepyException, ValueError) as e:
+            with self._lock:
+                self.stats['profile_errors'] += 1
+            return {"platform": platform, "handle": handle, "error": str(e)}
+
     def analyze_authenticity(self, profiles: Dict[str, Dict]) -> Dict:
         """Analyze profile data for authenticity indicators"""
         score = 0
+        issues = [f"⚠️ {platform} Profile unavailable: {data['error']}" for platform, data in profiles.items() if "error" in data]
+        profiles = {platform: data for platform, data in profiles.items() if "error" not in data}
         max_score = len(profiles) * 6  # 6 checks per platform
-        issues = []
         positives = []
         for platform, data in profiles.items():
             platform_score = 0
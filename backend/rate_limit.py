@@ -0,0 +1,49 @@
+import threading
+import time
+
+# (requests, window seconds) per platform; Twitter's user_timeline allows 900 calls per 15 minutes per user token
+PLATFORM_QUOTAS = {
+    'Twitter': (900, 15 * 60),
+    'Facebook': (200, 60 * 60),
+    'Instagram': (200, 60 * 60)
+}
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `capacity / window` tokens per second"""
+
+    def __init__(self, capacity, window):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting up to `timeout` seconds (forever if None); False if none became available"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return False
+            time.sleep(wait)
+
+    def block_until(self, reset_at):
+        """The API answered 429: hold every caller until its reset time (wall-clock epoch seconds)"""
+        with self._lock:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + max(reset_at - time.time(), 1))
+            self.tokens = 0.0
+            self.updated = now
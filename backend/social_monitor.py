@@ -2,53 +2,156 @@ import tweepy
 import requests
 from datetime import datetime, timedelta
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from backend.feed_merge import TopN
+from backend.keyword_matcher import compile_query
+from backend.platform_api import PlatformClient, PLATFORM_API
+from backend.post_store import PostStore, MONITOR_DB
+from backend.rate_limit import TokenBucket, PLATFORM_QUOTAS
+from backend.trend_detector import TrendDetector
 
 class SocialMonitor:
-    def __init__(self):
+    def __init__(self, max_concurrency=32, quotas=PLATFORM_QUOTAS, quota_wait=30, db_path=MONITOR_DB,
+                 page_size=200, max_pages=5, api_base=PLATFORM_API):
         self.twitter_api = None
         self.facebook_api = None
         self.instagram_api = None
-        self.setup_apis()
+        self.quota_wait = quota_wait
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.store = PostStore(db_path)
+        self.stats = {'fetch_failures': 0}
+        self._stats_lock = threading.Lock()
+        # Sample posts stand in only for the unconfigured live APIs; a configured platform API reports failures instead
+        self.sample_fallback = not api_base
+        self.trends = TrendDetector()
+        self.rate_limits = {platform: TokenBucket(*quota) for platform, quota in quotas.items()}
+        # The pool size is the global cap on in-flight platform calls
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='social-poll')
+        if api_base:
+            self.twitter_api = PlatformClient(api_base, pool_size=max_concurrency)
+        else:
+            self.setup_apis()
     
     def setup_apis(self):
         try:
             auth = tweepy.OAuthHandler("your_consumer_key", "your_consumer_secret")
             auth.set_access_token("your_access_token", "your_access_secret")
-            self.twitter_api = tweepy.API(auth, wait_on_rate_limit=True)
+            # Quota is enforced by our own token buckets; tweepy sleeping here would stall a pool worker for 15 minutes
+            self.twitter_api = tweepy.API(auth, wait_on_rate_limit=False)
         except:
             pass
     
-    def monitor_accounts(self, vip_accounts, keywords):
-        posts = []
-        
-        for account in vip_accounts:
-            account_posts = self._get_account_posts(account, keywords)
-            posts.extend(account_posts)
+    def monitor_accounts(self, vip_accounts, keywords, limit=10, sort_by='time'):
+        top = TopN(limit, sort_by)
+        top.extend(self.stream(vip_accounts, keywords, latest=True))
+        return top.items()
+
+    def poll(self, vip_accounts, keywords):
+        return list(self.stream(vip_accounts, keywords))
+
+    def stream(self, vip_accounts, keywords, batches=False, latest=False):
+        """Yield posts (or per-account lists of posts) as each account's fetch completes.
+
+        Only posts collected for the first time are yielded; latest=True yields each account's latest stored
+        posts instead, for a feed that should not go blank when nothing new was posted.
+        """
+        query = compile_query(keywords)
+        futures = [self.executor.submit(self._get_account_posts, account, query, latest) for account in vip_accounts]
         
-        return sorted(posts, key=lambda x: x['timestamp'], reverse=True)[:10]
+        for future in as_completed(futures):
+            posts = future.result()
+            if batches:
+                yield posts
+            else:
+                yield from posts
     
-    def _get_account_posts(self, account, keywords):
+    def _get_account_posts(self, account, keywords, latest=False):
+        query = compile_query(keywords)
         posts = []
+        fetched = False
         
         if self.twitter_api:
+            tweets = []
             try:
-                tweets = self.twitter_api.user_timeline(screen_name=account.replace('@', ''), count=5)
-                for tweet in tweets:
-                    if any(keyword.lower() in tweet.text.lower() for keyword in keywords):
-                        posts.append({
-                            'username': account,
-                            'platform': 'Twitter',
-                            'content': tweet.text[:200] + "..." if len(tweet.text) > 200 else tweet.text,
-                            'timestamp': tweet.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                            'engagement': f"{tweet.favorite_count + tweet.retweet_count}"
-                        })
+                tweets, fetched = self._fetch_new_tweets(account.replace('@', ''))
             except:
                 pass
+            if not fetched:
+                self._count_failure()
+            new = self.store.add_new([{
+                'id': tweet.id,
+                'username': account,
+                'platform': 'Twitter',
+                'content': tweet.text[:200] + "..." if len(tweet.text) > 200 else tweet.text,
+                'timestamp': tweet.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'engagement': f"{tweet.favorite_count + tweet.retweet_count}"
+            } for tweet in tweets])
+            for post in new:
+                matched = query.match(post['content'])
+                if matched is not None:
+                    posts.append(dict(post, matched_terms=matched))
+                    # Each post feeds the trend counts once, when it is first collected
+                    self.trends.observe(post['content'], post['timestamp'])
+            if latest:
+                # The feed shows the latest stored posts, which also covers a failed fetch
+                posts = []
+                for post in self.store.recent('Twitter', account, self.page_size):
+                    matched = query.match(post['content'])
+                    if matched is not None:
+                        posts.append(dict(post, matched_terms=matched))
         
-        if not posts:
-            posts = self._generate_sample_posts(account, keywords)
+        # An empty result from a successful incremental poll just means nothing matching has been posted
+        if not posts and not fetched and self.sample_fallback:
+            posts = self._generate_sample_posts(account, query.terms or ['news'])
+            for post in posts:
+                self.trends.observe(post['content'], post['timestamp'])
         
         return posts
+
+    def _count_failure(self):
+        with self._stats_lock:
+            self.stats['fetch_failures'] += 1
+
+    def _fetch_new_tweets(self, handle):
+        """Tweets newer than the stored cursor, paging back until the cursor is reached; (tweets, any page fetched)"""
+        since_id = self.store.cursor('Twitter', handle)
+        count = self.page_size if since_id else 5
+        tweets = []
+        pages = 0
+        complete = False
+        max_id = None
+        
+        for _ in range(self.max_pages if since_id else 1):
+            if not self.rate_limits['Twitter'].acquire(self.quota_wait):
+                break
+            params = {'screen_name': handle, 'count': count}
+            if since_id:
+                params['since_id'] = since_id
+            if max_id:
+                params['max_id'] = max_id
+            try:
+                page = self.twitter_api.user_timeline(**params)
+            except tweepy.TooManyRequests as e:
+                reset = e.response.headers.get('x-rate-limit-reset') if e.response is not None else None
+                self.rate_limits['Twitter'].block_until(float(reset) if reset else time.time() + 60)
+                break
+            pages += 1
+            tweets.extend(page)
+            if len(page) < count or not since_id:
+                complete = True
+                break
+            max_id = min(tweet.id for tweet in page) - 1
+        else:
+            # Backlog deeper than max_pages: older unseen tweets are given up rather than re-paged every poll
+            complete = True
+        
+        # A poll cut short by quota keeps the old cursor; the store drops whatever gets re-fetched next time
+        if tweets and complete:
+            self.store.advance('Twitter', handle, max(tweet.id for tweet in tweets))
+        return tweets, pages > 0
     
     def _generate_sample_posts(self, account, keywords):
         sample_posts = [
@@ -69,7 +172,5 @@ class SocialMonitor:
         
         return posts
     
-    def detect_trending_rumors(self):
-        trending = []
-        
-        return trending
\ No newline at end of file
+    def detect_trending_rumors(self, limit=10):
+        return self.trends.trending(limit)
\ No newline at end of file
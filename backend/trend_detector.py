@@ -0,0 +1,194 @@
+import math
+import re
+import threading
+import time
+import zlib
+from datetime import datetime
+import numpy as np
+from backend.fact_corpus import STOPWORDS
+from backend.normalize import URL_PATTERN, canonical_url
+
+HASHTAG_PATTERN = re.compile(r'#\w+')
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9'’]*")
+
+def extract_terms(text):
+    """Distinct trend terms of a post: canonical URLs, hashtags, and unigrams/bigrams minus stopwords"""
+    terms = {}
+    for url in URL_PATTERN.findall(text):
+        try:
+            url = canonical_url(url)
+        except ValueError:
+            # Unparsable URL text (e.g. an unterminated IPv6 host) is counted as written
+            pass
+        terms[url] = 'url'
+    text = URL_PATTERN.sub(' ', text).casefold()
+    for tag in HASHTAG_PATTERN.findall(text):
+        terms[tag] = 'hashtag'
+    words = [w for w in WORD_PATTERN.findall(HASHTAG_PATTERN.sub(' ', text)) if w not in STOPWORDS and len(w) > 2]
+    for word in words:
+        terms.setdefault(word, 'ngram')
+    for first, second in zip(words, words[1:]):
+        terms.setdefault(f'{first} {second}', 'ngram')
+    return terms
+
+class CountMinSketch:
+    """Fixed-size frequency sketch; estimates only ever over-count"""
+
+    def __init__(self, width=4096, depth=4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+
+    def indexes(self, term):
+        # Kirsch-Mitzenmacher: depth hash functions derived from two base hashes
+        data = term.encode('utf-8')
+        h1 = zlib.crc32(data)
+        h2 = zlib.adler32(data) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add_many(self, index_rows):
+        """One increment per row of `depth` indexes, applied in a single vectorised update"""
+        flat = np.asarray(index_rows, dtype=np.int64) + np.arange(self.depth) * self.width
+        np.add.at(self.table.reshape(-1), flat.ravel(), 1)
+
+    def estimate(self, indexes):
+        return int(self.table[np.arange(self.depth), indexes].min())
+
+class SpaceSaving:
+    """Space-saving heavy hitters with a stream-summary (count -> terms) layout: O(1) per increment"""
+
+    def __init__(self, capacity=200):
+        self.capacity = capacity
+        self.counts = {}
+        self.buckets = {}
+        self.min_count = 0
+
+    def add(self, term):
+        count = self.counts.get(term)
+        if count is None:
+            if len(self.counts) < self.capacity:
+                count = 0
+            else:
+                # Evict one of the least-counted terms; the newcomer inherits its count as error
+                bucket = self.buckets[self.min_count]
+                evicted = bucket.pop()
+                del self.counts[evicted]
+                count = self.min_count
+                if not bucket:
+                    del self.buckets[count]
+        else:
+            bucket = self.buckets[count]
+            bucket.discard(term)
+            if not bucket:
+                del self.buckets[count]
+        self.counts[term] = count + 1
+        self.buckets.setdefault(count + 1, set()).add(term)
+        if count == 0:
+            self.min_count = 1
+        elif count == self.min_count and count not in self.buckets:
+            self.min_count = count + 1
+        return count + 1
+
+    def clear(self):
+        self.counts.clear()
+        self.buckets.clear()
+        self.min_count = 0
+
+class TrendDetector:
+    """Spike detector over a sliding window of time slots; memory is fixed by the sketch and slot sizes
+
+    Each slot holds a count-min sketch and a space-saving candidate list. Running sketches of the
+    current window and of the baseline before it make both an update and a term lookup O(depth).
+    """
+
+    def __init__(self, slot_seconds=300, window_slots=6, baseline_slots=42, width=4096, depth=4, candidates=200):
+        self.slot_seconds = slot_seconds
+        self.window_slots = window_slots
+        self.total_slots = window_slots + baseline_slots
+        self.baseline_slots = baseline_slots
+        self.slots = [CountMinSketch(width, depth) for _ in range(self.total_slots)]
+        self.window = CountMinSketch(width, depth)
+        self.baseline = CountMinSketch(width, depth)
+        self.heavy = [SpaceSaving(candidates) for _ in range(self.total_slots)]
+        self.kinds = {}
+        self.head = None
+        self._lock = threading.Lock()
+
+    def _slot(self, when):
+        return int(when // self.slot_seconds)
+
+    def _advance(self, slot):
+        if self.head is None:
+            self.head = slot
+            return
+        for step in range(self.head + 1, min(slot, self.head + self.total_slots) + 1):
+            # The slot leaving the window joins the baseline; the slot leaving the ring is recycled
+            leaving_window = self.slots[(step - self.window_slots) % self.total_slots]
+            self.window.table -= leaving_window.table
+            self.baseline.table += leaving_window.table
+            recycled = self.slots[step % self.total_slots]
+            self.baseline.table -= recycled.table
+            recycled.table[:] = 0
+            self.heavy[step % self.total_slots].clear()
+        if slot - self.head >= self.total_slots:
+            self.window.table[:] = 0
+            self.baseline.table[:] = 0
+        self.head = max(self.head, slot)
+
+    def observe(self, text, when=None):
+        """Count one post's terms at `when` (epoch seconds, 'YYYY-mm-dd HH:MM:SS' or now)"""
+        if isinstance(when, str):
+            try:
+                when = datetime.strptime(when, '%Y-%m-%d %H:%M:%S').timestamp()
+            except ValueError:
+                when = None
+        slot = self._slot(when if when is not None else time.time())
+        terms = extract_terms(text)
+        with self._lock:
+            self._advance(slot)
+            age = self.head - slot
+            if age >= self.total_slots:
+                return
+            position = slot % self.total_slots
+            if not terms:
+                return
+            index_rows = [self.window.indexes(term) for term in terms]
+            self.slots[position].add_many(index_rows)
+            if age >= self.window_slots:
+                self.baseline.add_many(index_rows)
+                return
+            self.window.add_many(index_rows)
+            heavy = self.heavy[position]
+            for term, kind in terms.items():
+                heavy.add(term)
+                self.kinds[term] = kind
+            if len(self.kinds) > 4 * heavy.capacity * self.window_slots:
+                self.kinds = {t: k for t, k in self.kinds.items() if self._is_candidate(t)}
+
+    def _is_candidate(self, term):
+        return any(term in self.heavy[(self.head - age) % self.total_slots].counts for age in range(self.window_slots))
+
+    def trending(self, limit=10, min_count=5, min_ratio=3.0, min_score=3.0, now=None):
+        """Terms whose current-window count spikes above what their baseline rate predicts"""
+        with self._lock:
+            if now is not None:
+                self._advance(self._slot(now))
+            if self.head is None:
+                return []
+            candidates = set()
+            for age in range(self.window_slots):
+                candidates.update(self.heavy[(self.head - age) % self.total_slots].counts)
+
+            results = []
+            for term in candidates:
+                indexes = self.window.indexes(term)
+                current = self.window.estimate(indexes)
+                expected = self.baseline.estimate(indexes) * self.window_slots / self.baseline_slots
+                ratio = (current + 1) / (expected + 1)
+                score = (current - expected) / math.sqrt(expected + 1)
+                if current >= min_count and ratio >= min_ratio and score >= min_score:
+                    results.append({
+                        'term': term, 'kind': self.kinds.get(term, 'ngram'), 'count': current,
+                        'expected': round(expected, 2), 'ratio': round(ratio, 2), 'score': round(score, 2)
+                    })
+        return sorted(results, key=lambda r: r['score'], reverse=True)[:limit]
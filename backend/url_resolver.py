@@ -0,0 +1,225 @@
+import ipaddress
+import re
+import socket
+import sqlite3
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from backend.normalize import canonical_url
+
+URL_CACHE_DB = "url_cache.db"
+SKIP_TAGS = {'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'svg', 'button', 'iframe'}
+BLOCK_TAGS = {'p', 'h1', 'h2', 'h3', 'li', 'blockquote', 'figcaption'}
+META_TEXT = ('og:description', 'twitter:description', 'description')
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+class UnsafeUrlError(ValueError):
+    """The URL points at a loopback, private, link-local or otherwise non-public address"""
+
+def check_public_url(url):
+    """Raise UnsafeUrlError unless every address the URL's host resolves to is publicly routable"""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise UnsafeUrlError(f"only http(s) URLs can be checked: {url}")
+    try:
+        infos = socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80),
+                                   proto=socket.IPPROTO_TCP)
+    except socket.gaierror as e:
+        raise requests.ConnectionError(f"cannot resolve {parts.hostname}: {e}")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split('%')[0])
+        if not address.is_global:
+            raise UnsafeUrlError(f"refusing to fetch non-public address {address} ({parts.hostname})")
+
+def _decode(body, response):
+    # requests assumes ISO-8859-1 for text/* without a charset, which garbles UTF-8 pages
+    if 'charset=' in response.headers.get('Content-Type', '').lower() and response.encoding:
+        encoding = response.encoding
+    else:
+        declared = META_CHARSET.search(body[:4096])
+        encoding = declared.group(1).decode('ascii') if declared else None
+        if encoding is None:
+            try:
+                return body.decode('utf-8')
+            except UnicodeDecodeError:
+                encoding = requests.compat.chardet.detect(body)['encoding'] if requests.compat.chardet else None
+    try:
+        return body.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+class _MainTextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ''
+        self.meta = {}
+        self.blocks = []
+        self.loose = []
+        self._skip = 0
+        self._in_title = False
+        self._block = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag == 'title':
+            self._in_title = True
+        elif tag == 'meta':
+            attrs = dict(attrs)
+            key = (attrs.get('property') or attrs.get('name') or '').lower()
+            if key in META_TEXT + ('og:title',) and attrs.get('content'):
+                self.meta.setdefault(key, attrs['content'].strip())
+        elif tag in BLOCK_TAGS and not self._skip:
+            self._block = []
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self._skip:
+            self._skip -= 1
+        elif tag == 'title':
+            self._in_title = False
+        elif tag in BLOCK_TAGS and self._block is not None:
+            text = ' '.join(''.join(self._block).split())
+            if len(text.split()) >= 4:
+                self.blocks.append(text)
+            self._block = None
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif self._skip:
+            return
+        elif self._block is not None:
+            self._block.append(data)
+        elif data.strip():
+            self.loose.append(data.strip())
+
+def extract_main_text(html, max_chars=20000):
+    """Title plus the article-like text of a page: paragraph blocks, else social-card meta text, else all text"""
+    parser = _MainTextParser()
+    parser.feed(html)
+    parser.close()
+    title = parser.meta.get('og:title') or ' '.join(parser.title.split())
+    text = '\n\n'.join(parser.blocks)
+    if len(text) < 200:
+        meta_text = next((parser.meta[key] for key in META_TEXT if key in parser.meta), '')
+        text = meta_text if len(meta_text) >= len(text) else text
+    if not text:
+        text = ' '.join(parser.loose)
+    return title, text[:max_chars]
+
+class UrlResolver:
+    """Fetches a URL once into a persistent cache keyed by canonical URL, revalidating with ETag/Last-Modified"""
+
+    def __init__(self, db_path=URL_CACHE_DB, max_bytes=2 * 1024 * 1024, timeout=10.0, fresh_for=600, pool_size=8,
+                 max_redirects=5, allow_private=False):
+        self.max_bytes = max_bytes
+        self.max_redirects = max_redirects
+        self.allow_private = allow_private
+        self.timeout = timeout
+        self.fresh_for = fresh_for
+        self.stats = {'fresh_hits': 0, 'not_modified': 0, 'downloads': 0, 'stale_fallbacks': 0}
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; SoteriaFactChecker/1.0)'
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                title TEXT,
+                text TEXT,
+                fetched_at REAL,
+                checked_at REAL
+            )
+        ''')
+        self.conn.commit()
+
+    def resolve(self, url):
+        key = canonical_url(url)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, title, text, checked_at FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+
+        if row and time.time() - row[4] < self.fresh_for:
+            self.stats['fresh_hits'] += 1
+            return {'url': key, 'title': row[2], 'text': row[3], 'status': 'cached'}
+
+        headers = {}
+        if row and row[0]:
+            headers['If-None-Match'] = row[0]
+        if row and row[1]:
+            headers['If-Modified-Since'] = row[1]
+
+        try:
+            response = self._get(url, headers)
+            with response:
+                if response.status_code == 304 and row:
+                    self._touch(key)
+                    self.stats['not_modified'] += 1
+                    return {'url': key, 'title': row[2], 'text': row[3], 'status': 'not_modified'}
+                response.raise_for_status()
+                body = self._read_capped(response)
+                html = _decode(body, response)
+                content_type = response.headers.get('Content-Type', '')
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except requests.RequestException:
+            if not row:
+                raise
+            self.stats['stale_fallbacks'] += 1
+            return {'url': key, 'title': row[2], 'text': row[3], 'status': 'stale'}
+
+        if 'html' in content_type or html.lstrip()[:1] == '<':
+            title, text = extract_main_text(html)
+        else:
+            title, text = '', html[:20000]
+
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, title, text, fetched_at, checked_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, title, text, now, now)
+            )
+            self.conn.commit()
+        self.stats['downloads'] += 1
+        return {'url': key, 'title': title, 'text': text, 'status': 'downloaded'}
+
+    def _get(self, url, headers):
+        # Redirects are followed by hand so every hop is checked before anything is requested from it
+        for _ in range(self.max_redirects + 1):
+            if not self.allow_private:
+                check_public_url(url)
+            response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout, allow_redirects=False)
+            if not response.is_redirect:
+                return response
+            url = urljoin(url, response.headers['Location'])
+            response.close()
+        raise requests.TooManyRedirects(f"more than {self.max_redirects} redirects")
+
+    def _read_capped(self, response):
+        # Both caps apply to the body as a whole: a slow-drip or oversized page is cut off, not waited out
+        deadline = time.monotonic() + self.timeout
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes or time.monotonic() > deadline:
+                break
+        return b''.join(chunks)[:self.max_bytes]
+
+    def _touch(self, key):
+        with self._lock:
+            self.conn.execute("UPDATE pages SET checked_at = ? WHERE url = ?", (time.time(), key))
+            self.conn.commit()
@@ -0,0 +1,103 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from backend.normalize import claim_fingerprint
+
+CACHE_DB = "verdict_cache.db"
+
+class VerdictCache:
+    """Two-tier verdict cache: in-process LRU in front of a SQLite table shared by every app process"""
+
+    def __init__(self, db_path=CACHE_DB, max_entries=4096, ttl=24 * 3600, evidence_ttl=3600, namespace=''):
+        # Verdicts from different models never share a key, so a model change starts from a cold cache
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evidence_ttl = evidence_ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evidence_refreshes': 0}
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS verdicts (
+                fingerprint TEXT PRIMARY KEY,
+                result TEXT,
+                created_at REAL,
+                evidence_at REAL
+            )
+        ''')
+        self.conn.commit()
+
+    def get(self, claim):
+        """Return (result, evidence_fresh) for a cached claim, or None on a miss"""
+        fingerprint = self._key(claim)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(fingerprint)
+            if entry is not None:
+                self._memory.move_to_end(fingerprint)
+                tier = 'memory_hits'
+            else:
+                entry = self.conn.execute(
+                    "SELECT result, created_at, evidence_at FROM verdicts WHERE fingerprint = ?", (fingerprint,)
+                ).fetchone()
+                tier = 'disk_hits'
+
+            if entry is None or now - entry[1] > self.ttl:
+                self._memory.pop(fingerprint, None)
+                self.stats['misses'] += 1
+                return None
+
+            self.stats[tier] += 1
+            if tier == 'disk_hits':
+                self._remember(fingerprint, entry)
+
+        result = json.loads(entry[0])
+        result['cached'] = True
+        return result, now - entry[2] <= self.evidence_ttl
+
+    def put(self, claim, result):
+        fingerprint = self._key(claim)
+        now = time.time()
+        entry = (json.dumps({k: v for k, v in result.items() if k != 'cached'}), now, now)
+        with self._lock:
+            self._remember(fingerprint, entry)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO verdicts (fingerprint, result, created_at, evidence_at) VALUES (?, ?, ?, ?)",
+                (fingerprint,) + entry
+            )
+            self.conn.commit()
+
+    def refresh_evidence(self, claim, evidence):
+        """Swap in freshly gathered evidence; the verdict keeps its original age and timestamp"""
+        fingerprint = self._key(claim)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT result, created_at FROM verdicts WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row is None:
+                return
+            result = json.loads(row[0])
+            result['evidence'] = evidence
+            entry = (json.dumps(result), row[1], now)
+            self._remember(fingerprint, entry)
+            self.conn.execute(
+                "UPDATE verdicts SET result = ?, evidence_at = ? WHERE fingerprint = ?", (entry[0], now, fingerprint)
+            )
+            self.conn.commit()
+            self.stats['evidence_refreshes'] += 1
+
+    def _key(self, claim):
+        fingerprint = claim_fingerprint(claim)
+        return f"{self.namespace}:{fingerprint}" if self.namespace else fingerprint
+
+    def _remember(self, fingerprint, entry):
+        self._memory[fingerprint] = entry
+        self._memory.move_to_end(fingerprint)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
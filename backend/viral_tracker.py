@@ -1,15 +1,158 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import math
 import random
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, TimeoutError as FutureTimeout
+from backend.cascade_forecast import CascadeForecaster
+from backend.platform_api import PlatformClient, PLATFORM_API
+
+def synthetic_engagement(content_url, platform, now=None, hours=48):
+    """Deterministic stand-in share events (timestamps, shares) for one URL on one platform"""
+    rng = np.random.default_rng(zlib.crc32(f"{content_url}|{platform}".encode('utf-8')))
+    now = int(now or time.time())
+    # Rise over the first 6 hours, plateau until 24, then decay; the cascade started `hours` ago
+    n = int(rng.integers(100, 2000))
+    age = np.concatenate([
+        6 * np.sqrt(rng.uniform(0, 1, n // 5)),
+        rng.uniform(6, 24, n // 2),
+        24 + rng.exponential(10, n - n // 5 - n // 2).clip(0, hours - 24 - 1e-6)
+    ])
+    timestamps = (now - hours * 3600 + age * 3600).astype(np.int64)
+    return np.sort(timestamps), rng.integers(1, 5, len(timestamps))
+
+def _score_cascade(platforms, interval, timestamps, codes, shares):
+    # Runs in a worker process: only arrays in, scalars out
+    tracker = ViralTracker()
+    tracker.platforms = platforms
+    timeline, platform_data = tracker.aggregate_events(timestamps, codes, shares, interval=interval)
+    growth = timeline['shares'].pct_change().mean()
+    return {
+        'viral_score': float(tracker._calculate_viral_score(timeline)),
+        'total_shares': int(timeline['shares'].sum()),
+        'peak_shares': int(timeline['shares'].max()),
+        'peak_time': timeline['time'].iloc[int(timeline['shares'].values.argmax())],
+        'growth_rate': float(growth),
+        'top_platform': platform_data['platform'].iloc[int(platform_data['shares'].values.argmax())]
+    }
+
+class StreamingViralScore:
+    """O(1)-per-bucket viral score for one cascade; score() equals _calculate_viral_score on the same series"""
+
+    def __init__(self, half_life=6):
+        self.alpha = 1 - 2 ** (-1 / half_life)
+        self.buckets = 0
+        self.peak = None
+        self.previous = None
+        # Running mean of pct_change with pandas semantics: 0/0 is NaN (skipped), x/0 is +/-inf
+        self.growth_sum = 0.0
+        self.growth_compensation = 0.0
+        self.growth_count = 0
+        self.pos_inf = 0
+        self.neg_inf = 0
+        # Exponentially decayed moments of growth and of its change (acceleration)
+        self.ew_growth = 0.0
+        self.ew_growth_var = 0.0
+        self.ew_acceleration = 0.0
+        self.last_growth = None
+
+    def update(self, shares):
+        self.buckets += 1
+        if self.peak is None or shares > self.peak:
+            self.peak = shares
+        previous, self.previous = self.previous, shares
+        if previous is None:
+            return
+        if previous == 0:
+            if shares == 0:
+                return
+            if shares > 0:
+                self.pos_inf += 1
+            else:
+                self.neg_inf += 1
+            self.growth_count += 1
+            return
+
+        growth = float(shares) / float(previous) - 1
+        self.growth_count += 1
+        # Neumaier-compensated sum so a long stream doesn't drift from the batch mean
+        total = self.growth_sum + growth
+        if abs(self.growth_sum) >= abs(growth):
+            self.growth_compensation += (self.growth_sum - total) + growth
+        else:
+            self.growth_compensation += (growth - total) + self.growth_sum
+        self.growth_sum = total
+
+        if self.last_growth is None:
+            self.ew_growth = growth
+        else:
+            delta = growth - self.ew_growth
+            self.ew_growth += self.alpha * delta
+            self.ew_growth_var = (1 - self.alpha) * (self.ew_growth_var + self.alpha * delta * delta)
+            self.ew_acceleration += self.alpha * ((growth - self.last_growth) - self.ew_acceleration)
+        self.last_growth = growth
+
+    def extend(self, shares):
+        for value in shares:
+            self.update(value)
+        return self
+
+    @property
+    def growth_rate(self):
+        if self.pos_inf and self.neg_inf:
+            return math.nan
+        if self.pos_inf:
+            return math.inf
+        if self.neg_inf:
+            return -math.inf
+        if not self.growth_count:
+            return math.nan
+        return (self.growth_sum + self.growth_compensation) / self.growth_count
+
+    def _score(self, growth_rate):
+        if self.peak is None:
+            return math.nan
+        viral_score = min((self.peak / 1000) * (1 + growth_rate), 10.0)
+        # The batch score rounds an np.float64, and numpy rounds halfway cases differently from round() on a float
+        return np.round(np.float64(viral_score), 2)
+
+    def score(self):
+        return self._score(self.growth_rate)
+
+    def decayed_score(self):
+        """Same formula with the recency-weighted growth rate, for ranking live cascades"""
+        return self._score(self.ew_growth if self.last_growth is not None else self.growth_rate)
+
+    def stats(self):
+        return {
+            'buckets': self.buckets, 'peak': self.peak, 'growth_rate': self.growth_rate,
+            'ew_growth': self.ew_growth, 'ew_growth_std': math.sqrt(self.ew_growth_var),
+            'ew_acceleration': self.ew_acceleration, 'viral_score': self.score(), 'decayed_score': self.decayed_score()
+        }
 
 class ViralTracker:
-    def __init__(self):
+    def __init__(self, store=None, api_base=PLATFORM_API, max_workers=32):
         self.platforms = ['Twitter', 'Facebook', 'Instagram', 'YouTube', 'TikTok', 'Reddit']
+        self.live_scores = {}
+        self.store = store
+        self.max_workers = max_workers
+        # One pooled client per platform, shared by every concurrent fetch against it
+        self.platform_clients = {
+            platform: PlatformClient(api_base, pool_size=max_workers) for platform in self.platforms
+        } if api_base else None
+        self._fetch_pool = None
+        self._score_pool = None
     
-    def track_viral(self, content_url):
-        timeline_data = self._generate_viral_timeline()
-        platform_data = self._analyze_platform_engagement()
+    def track_viral(self, content_url, events=None, interval=3600):
+        if events is not None:
+            if self.store is not None:
+                self.store.merge_snapshot(content_url, *events[:3])
+            timeline_data, platform_data = self.aggregate_events(*events, interval=interval)
+        else:
+            timeline_data = self._generate_viral_timeline()
+            platform_data = self._analyze_platform_engagement()
         influencer_data = self._identify_key_influencers()
         
         return {
@@ -21,25 +164,73 @@ class ViralTracker:
     
     def _generate_viral_timeline(self):
         hours = 48
-        timeline = []
         base_shares = 100
+        hour = np.arange(hours)
+        multiplier = np.where(
+            hour < 6, 1 + hour * 0.2,
+            np.where(hour < 24, 2 + np.random.uniform(0, 3, hours), np.maximum(1, 5 - (hour - 24) * 0.1))
+        )
+        shares = (base_shares * multiplier * np.random.uniform(0.8, 1.2, hours)).astype(int)
         
-        for hour in range(hours):
-            if hour < 6:
-                multiplier = 1 + (hour * 0.2)
-            elif hour < 24:
-                multiplier = 2 + random.uniform(0, 3)
-            else:
-                multiplier = max(1, 5 - (hour-24) * 0.1)
-            
-            shares = int(base_shares * multiplier * random.uniform(0.8, 1.2))
-            timeline.append({
-                'time': (datetime.now() - timedelta(hours=hours-hour)).strftime('%Y-%m-%d %H:%M'),
-                'shares': shares,
-                'engagement': shares * random.uniform(2, 5)
-            })
-        
-        return pd.DataFrame(timeline)
+        return pd.DataFrame({
+            'time': pd.date_range(end=datetime.now() - timedelta(hours=1), periods=hours, freq='h').strftime('%Y-%m-%d %H:%M'),
+            'shares': shares,
+            'engagement': shares * np.random.uniform(2, 5, hours)
+        })
+
+    def encode_platforms(self, names):
+        """Platform names -> integer codes into self.platforms (unknown names get -1)"""
+        unique, inverse = np.unique(np.asarray(names), return_inverse=True)
+        lookup = np.array([self.platforms.index(name) if name in self.platforms else -1 for name in unique])
+        return lookup[inverse]
+
+    def aggregate_events(self, timestamps, platforms, shares, engagement=None, interval=3600, start=None, end=None):
+        """Bin raw share events into a timeline and per-platform totals in one vectorised pass
+
+        timestamps are epoch seconds or datetime64, platforms are codes into self.platforms,
+        shares/engagement are per-event counts (engagement defaults to shares).
+        """
+        timestamps = np.asarray(timestamps)
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype('datetime64[s]').astype(np.int64)
+        platforms = np.asarray(platforms, dtype=np.int64)
+        shares = np.asarray(shares, dtype=np.float64)
+        engagement = shares if engagement is None else np.asarray(engagement, dtype=np.float64)
+
+        if start is None:
+            start = timestamps.min() // interval * interval if len(timestamps) else 0
+        if end is None:
+            end = timestamps.max() + 1 if len(timestamps) else start + interval
+        n_bins = max(int(-(-(end - start) // interval)), 1)
+        n_platforms = len(self.platforms)
+
+        bins = (timestamps - start) // interval
+        keep = (bins >= 0) & (bins < n_bins) & (platforms >= 0) & (platforms < n_platforms)
+        if not keep.all():
+            bins, platforms, shares, engagement = bins[keep], platforms[keep], shares[keep], engagement[keep]
+
+        # One (bin, platform) cell grid per measure; the timeline and the platform totals are its margins
+        cells = bins * n_platforms + platforms
+        size = n_bins * n_platforms
+        share_grid = np.bincount(cells, weights=shares, minlength=size).reshape(n_bins, n_platforms)
+        engagement_grid = share_grid if engagement is shares else \
+            np.bincount(cells, weights=engagement, minlength=size).reshape(n_bins, n_platforms)
+
+        timeline = pd.DataFrame({
+            'time': pd.to_datetime(start + np.arange(n_bins) * interval, unit='s'),
+            'shares': share_grid.sum(axis=1).astype(np.int64),
+            'engagement': engagement_grid.sum(axis=1)
+        })
+        platform_shares = share_grid.sum(axis=0)
+        platform_engagement = engagement_grid.sum(axis=0)
+        platform_data = pd.DataFrame({
+            'platform': self.platforms,
+            'engagement': platform_engagement,
+            'shares': platform_shares.astype(np.int64),
+            'share_rate': np.divide(platform_shares, platform_engagement,
+                                    out=np.zeros(n_platforms), where=platform_engagement > 0)
+        })
+        return timeline, platform_data
     
     def _analyze_platform_engagement(self):
         platform_data = []
@@ -65,6 +256,95 @@ class ViralTracker:
         
         return influencers
     
+    def fetch_engagement(self, content_url, platform):
+        """Share events (timestamps, shares) for a URL on one platform"""
+        if self.platform_clients:
+            data = self.platform_clients[platform].engagement(platform, content_url)
+            return np.asarray(data['timestamps'], dtype=np.int64), np.asarray(data['shares'], dtype=np.int64)
+        # Anchored to the hour, so refreshes within an hour see the same stand-in series
+        return synthetic_engagement(content_url, platform, now=int(time.time()) // 3600 * 3600)
+
+    def track_viral_many(self, urls, timeout=30.0, interval=3600, processes=None):
+        """Fetch and score a watchlist concurrently; one row per URL, with partial results past the timeout"""
+        deadline = time.monotonic() + timeout
+        urls = list(dict.fromkeys(urls))
+        if self._fetch_pool is None:
+            self._fetch_pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix='viral-fetch')
+        fetches = {
+            self._fetch_pool.submit(self.fetch_engagement, url, platform): (url, code)
+            for url in urls for code, platform in enumerate(self.platforms)
+        }
+        done, pending = wait(fetches, timeout=max(deadline - time.monotonic(), 0))
+        for future in pending:
+            future.cancel()
+
+        gathered = {url: {'events': [], 'fetched': 0, 'errors': 0} for url in urls}
+        for future in done:
+            url, code = fetches[future]
+            if future.exception() is not None:
+                gathered[url]['errors'] += 1
+                continue
+            timestamps, shares = future.result()
+            gathered[url]['events'].append((timestamps, np.full(len(timestamps), code, dtype=np.int8), shares))
+            gathered[url]['fetched'] += 1
+
+        if self._score_pool is None:
+            self._score_pool = ProcessPoolExecutor(processes)
+        scoring = {}
+        for url, item in gathered.items():
+            if not item['events']:
+                continue
+            timestamps, codes, shares = (np.concatenate(column) for column in zip(*item['events']))
+            if self.store is not None:
+                self.store.merge_snapshot(url, timestamps, codes, shares)
+            scoring[url] = self._score_pool.submit(_score_cascade, self.platforms, interval, timestamps, codes, shares)
+
+        rows = []
+        for url, item in gathered.items():
+            row = {'url': url, 'platforms_fetched': item['fetched'], 'fetch_errors': item['errors']}
+            if url in scoring:
+                try:
+                    row.update(scoring[url].result(timeout=max(deadline - time.monotonic(), 0)))
+                    row['status'] = 'ok' if item['fetched'] == len(self.platforms) else 'partial'
+                except FutureTimeout:
+                    scoring[url].cancel()
+                    row['status'] = 'timeout'
+                except Exception:
+                    row['status'] = 'error'
+            else:
+                row['status'] = 'error' if item['errors'] else 'timeout'
+            rows.append(row)
+
+        columns = ['url', 'status', 'viral_score', 'total_shares', 'peak_shares', 'peak_time', 'growth_rate',
+                   'top_platform', 'platforms_fetched', 'fetch_errors']
+        return pd.DataFrame(rows).reindex(columns=columns)
+
+    def forecast_spread(self, urls, days=7, horizon_hours=168, reach_threshold=10000):
+        """Hawkes forecast of final reach and time to peak for every stored URL, fitted in one vectorised pass"""
+        if self.store is None:
+            return None
+        urls = [url for url in dict.fromkeys(urls) if self.store.span(url) is not None]
+        if not urls:
+            return None
+        end = int(time.time()) // 3600 * 3600
+        counts = np.stack([self.store.query(url, end - days * 86400, end, 'hour')['shares'].values for url in urls])
+        return CascadeForecaster(interval=3600).forecast_frame(urls, counts, horizon_hours, reach_threshold)
+
+    def history(self, content_url, days=30, resolution=None):
+        """Stored share history of a URL over the last `days`, at the given or an automatic resolution"""
+        if self.store is None or self.store.span(content_url) is None:
+            return None
+        end = int(time.time())
+        return self.store.query(content_url, end - days * 86400, end, resolution)
+
+    def update_live_score(self, content_url, shares):
+        """Feed the newest bucket's share count for a URL; returns its running scorer"""
+        scorer = self.live_scores.get(content_url)
+        if scorer is None:
+            scorer = self.live_scores[content_url] = StreamingViralScore()
+        scorer.update(shares)
+        return scorer
+
     def _calculate_viral_score(self, timeline_data):
         max_shares = timeline_data['shares'].max()
         growth_rate = timeline_data['shares'].pct_change().mean()
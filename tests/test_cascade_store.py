@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+import numpy as np
+from backend.cascade_store import CascadeStore
+
+URL = 'https://example.com/story'
+
+class MergeSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CascadeStore(self.tmp.name)
+        self.timestamps = np.array([100, 200, 300, 300, 400])
+        self.platforms = np.array([0, 0, 0, 0, 1])
+        self.shares = np.array([1, 2, 3, 4, 5])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def total(self):
+        return int(self.store.cascades()['total_shares'].sum())
+
+    def test_repeated_snapshots_are_stored_once(self):
+        for _ in range(3):
+            self.store.merge_snapshot(URL, self.timestamps, self.platforms, self.shares)
+        self.assertEqual(self.total(), 15)
+
+    def test_platform_missing_from_a_partial_fetch_keeps_its_history(self):
+        only_second = self.platforms == 1
+        self.store.merge_snapshot(URL, self.timestamps[only_second], self.platforms[only_second], self.shares[only_second])
+        self.assertEqual(self.store.merge_snapshot(URL, self.timestamps, self.platforms, self.shares), 4)
+        self.assertEqual(self.total(), 15)
+
+    def test_same_second_events_past_the_mark_are_kept(self):
+        self.store.merge_snapshot(URL, self.timestamps, self.platforms, self.shares)
+        grown = (np.append(self.timestamps, [300, 400]), np.append(self.platforms, [0, 1]), np.append(self.shares, [7, 8]))
+        self.assertEqual(self.store.merge_snapshot(URL, *grown), 2)
+        self.assertEqual(self.total(), 30)
+
+class UnknownPlatformTest(unittest.TestCase):
+    def test_unknown_platform_codes_are_dropped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = CascadeStore(tmp)
+            # -1 is what encode_platforms gives an unknown name such as 'Mastodon'
+            self.assertEqual(store.append(URL, [0, 3600, 3601], [-1, 5, -1], [4, 2, 9]), 1)
+            frame = store.query(URL, 0, 7200, 'hour')
+            self.assertEqual(frame['shares'].tolist(), [0, 2])
+            self.assertEqual(frame['Reddit'].tolist(), [0, 2])
+            self.assertEqual(store.events(URL, 0, 7200)[1].tolist(), [5])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+import numpy as np
+from backend.claim_index import ClaimIndex
+
+def clustered(n, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = np.random.default_rng(99).standard_normal((50, dim))
+    vectors = centers[rng.integers(0, 50, n)] + 0.5 * rng.standard_normal((n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+class ClaimIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = ClaimIndex(self.tmp.name, dim=32, chunk_rows=500, ivf_min_rows=1000, segment_rows=200,
+                                max_segments=2, nprobe=8)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def add(self, vectors, prefix):
+        n = len(vectors)
+        self.index.add([f"{prefix} {i}" for i in range(n)], vectors, ['Rumor'] * n, [0.5] * n, [''] * n)
+
+    def test_small_index_is_searched_exactly(self):
+        vectors = clustered(300)
+        self.add(vectors, 'claim')
+        hits = self.index.search(vectors[:5], k=1)
+        self.assertEqual([h[0]['claim'] for h in hits], [f"claim {i}" for i in range(5)])
+        self.assertIsNone(self.index._load_ivf())
+
+    def test_inverted_file_covers_appended_rows(self):
+        self.add(clustered(1200, seed=1), 'first')
+        for batch in range(5):
+            self.add(clustered(150, seed=10 + batch), f"batch{batch}")
+
+        matrix = self.index._matrix()
+        state = self.index._ivf(matrix)
+        self.assertIsNotNone(state)
+        listed = np.concatenate([ids for _, ids, _ in state[2]]).tolist()
+        self.assertEqual(sorted(listed), list(range(state[3])))
+        self.assertLessEqual(len(state[2]), 2)
+
+        queries = np.asarray(matrix[::37], dtype=np.float32)
+        for hits in self.index.search(queries, k=1):
+            self.assertGreater(hits[0]['similarity'], 0.999)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+from backend.claim_splitter import ClaimSplitter
+
+class SentencesTest(unittest.TestCase):
+    def setUp(self):
+        self.splitter = ClaimSplitter()
+
+    def test_closing_quotes_and_brackets_stay_with_their_sentence(self):
+        text = 'He said "the vaccine is safe for kids." (The study was retracted last year.) Nobody checked the data.'
+        self.assertEqual(self.splitter.sentences(text), [
+            'He said "the vaccine is safe for kids."', '(The study was retracted last year.)', 'Nobody checked the data.'
+        ])
+
+    def test_sentence_starting_with_an_abbreviation_is_not_merged_backwards(self):
+        text = "The vote happened on Monday night. Dr. Smith said the results were rigged. Officials met Gov. Newsom today."
+        self.assertEqual(self.splitter.sentences(text), [
+            "The vote happened on Monday night.", "Dr. Smith said the results were rigged.", "Officials met Gov. Newsom today."
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
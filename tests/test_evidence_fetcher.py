@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from backend.evidence_fetcher import EvidenceFetcher
+from backend.fact_checker import FactChecker, FALLBACK_EVIDENCE
+
+# path -> (delay seconds, JSON payload)
+ENDPOINTS = {
+    '/fast': (0.0, {'articles': [{'title': 'Fast article', 'source': {'name': 'Wire'}}]}),
+    '/slow': (0.3, {'results': [{'headline': 'Slow result'}]}),
+    '/late': (2.0, {'items': [{'title': 'Too late'}]}),
+    '/broken': (0.0, None),
+    '/drip': (0.0, {'items': [{'title': 'Dripped'}]})
+}
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        delay, payload = ENDPOINTS[urlsplit(self.path).path]
+        time.sleep(delay)
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b'{}'
+        self.send_response(200 if payload is not None else 500)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        # /drip sends one byte at a time, each well inside a per-read timeout
+        chunks = [bytes([byte]) for byte in body] if self.path.startswith('/drip') else [body]
+        try:
+            for chunk in chunks:
+                self.wfile.write(chunk)
+                self.wfile.flush()
+                time.sleep(0.05 if len(chunks) > 1 else 0)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the fetcher gave up on this response
+
+class EvidenceFetcherTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def fetcher(self, *paths, deadline=1.0):
+        return EvidenceFetcher({path.strip('/'): self.base + path for path in paths}, deadline=deadline)
+
+    def test_sources_are_labelled_in_configuration_order(self):
+        evidence = self.fetcher('/fast', '/slow').fetch("claim")
+        self.assertEqual(evidence, [('Fast article', 'fast / Wire'), ('Slow result', 'slow')])
+
+    def test_sources_run_concurrently(self):
+        fetcher = EvidenceFetcher({f'slow{i}': self.base + '/slow' for i in range(3)}, deadline=1.0)
+        started = time.monotonic()
+        evidence = fetcher.fetch("claim")
+        self.assertEqual(len(evidence), 3)
+        self.assertLess(time.monotonic() - started, 0.8)
+
+    def test_deadline_drops_late_sources(self):
+        started = time.monotonic()
+        evidence = self.fetcher('/fast', '/late', deadline=0.5).fetch("claim")
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(evidence, [('Fast article', 'fast / Wire')])
+
+    def test_slow_drip_body_is_cut_off_at_the_deadline(self):
+        fetcher = EvidenceFetcher({'drip': self.base + '/drip'}, deadline=0.3, max_workers=1)
+        self.assertEqual(fetcher.fetch("claim"), [])
+        # The only worker must be free again shortly after the deadline, not when the drip ends
+        fetcher.executor.submit(lambda: None).result(timeout=0.3)
+
+    def test_batch_shares_one_deadline(self):
+        fetcher = EvidenceFetcher({'late': self.base + '/late'}, deadline=0.3, max_workers=2)
+        started = time.monotonic()
+        self.assertEqual(fetcher.fetch_many([f"claim {i}" for i in range(6)]), [[]] * 6)
+        self.assertLess(time.monotonic() - started, 0.8)
+
+    def test_errors_and_providers(self):
+        fetcher = self.fetcher('/broken')
+        fetcher.register_provider('local', lambda claim, timeout: [(f"Corpus hit for {claim}", 'Local')])
+        self.assertEqual(fetcher.fetch_many(["a", "b"]), [[('Corpus hit for a', 'Local')], [('Corpus hit for b', 'Local')]])
+
+    def test_fact_checker_falls_back_when_nothing_arrives(self):
+        checker = FactChecker.__new__(FactChecker)
+        checker.evidence_fetcher = self.fetcher('/late', '/broken', deadline=0.3)
+        self.assertEqual(checker._gather_evidence_many(["claim"]), [list(FALLBACK_EVIDENCE)])
+
+        checker.evidence_fetcher = self.fetcher('/fast')
+        self.assertEqual(checker._gather_evidence_many(["claim"]), [['Fast article - fast / Wire']])
+
+if __name__ == '__main__':
+    unittest.main()
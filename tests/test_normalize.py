@@ -0,0 +1,14 @@
+import unittest
+from backend.normalize import claim_fingerprint, normalize_claim
+
+class NormalizeClaimTest(unittest.TestCase):
+    def test_text_is_folded_but_url_paths_are_not(self):
+        self.assertEqual(normalize_claim("  SEE  https://WWW.Bit.ly/AbC?utm_source=x  NOW "), "see https://bit.ly/AbC now")
+        self.assertNotEqual(claim_fingerprint("see https://bit.ly/AbC"), claim_fingerprint("see https://bit.ly/abc"))
+
+    def test_tracking_parameters_and_case_of_text_do_not_matter(self):
+        self.assertEqual(claim_fingerprint("Vaccine claim https://example.com/a/?fbclid=1&b=2"),
+                         claim_fingerprint("vaccine CLAIM https://example.com/a?b=2"))
+
+if __name__ == '__main__':
+    unittest.main()
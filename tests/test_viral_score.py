@@ -0,0 +1,42 @@
+import math
+import unittest
+import numpy as np
+import pandas as pd
+from backend.viral_tracker import StreamingViralScore, ViralTracker
+
+def batch_score(shares):
+    return ViralTracker._calculate_viral_score(None, pd.DataFrame({'shares': shares}))
+
+def same(a, b):
+    return (math.isnan(a) and math.isnan(b)) or a == b
+
+class StreamingViralScoreTest(unittest.TestCase):
+    def assert_replay_matches(self, shares):
+        streamed = StreamingViralScore().extend(shares).score()
+        expected = batch_score(shares)
+        self.assertTrue(same(streamed, expected), f"{list(shares)}: streamed {streamed}, batch {expected}")
+
+    def test_halfway_rounding_matches_batch(self):
+        self.assert_replay_matches([3562, 355])
+
+    def test_zero_and_flat_series(self):
+        for shares in ([0, 0, 0], [0, 5, 10], [5, 0, 0], [7], [10, 10, 10], [0, 3, 0, 4]):
+            self.assert_replay_matches(shares)
+
+    def test_random_series_match_batch(self):
+        rng = np.random.default_rng(0)
+        for _ in range(500):
+            length = int(rng.integers(1, 60))
+            shares = rng.integers(0, 20000, size=length)
+            shares[rng.random(length) < 0.1] = 0
+            self.assert_replay_matches(shares.tolist())
+
+    def test_prefixes_match_batch(self):
+        shares = np.random.default_rng(1).integers(1, 5000, size=48).tolist()
+        score = StreamingViralScore()
+        for end, value in enumerate(shares, 1):
+            score.update(value)
+            self.assertTrue(same(score.score(), batch_score(shares[:end])))
+
+if __name__ == '__main__':
+    unittest.main()